@@ -0,0 +1,2 @@
+# the algorithms animated by the scenes as plain python, without manim, the modules use relative
+# imports so their demos run as modules from the repository root: python -m algorithms.two_sum
@@ -0,0 +1,108 @@
+import math
+import numpy as np
+import numpy.typing as npt
+from .step_trace import Step, Tracer
+
+
+COUNTERCLOCKWISE = 1
+COLLINEAR = 0
+CLOCKWISE = -1
+
+
+def orientation(p1: tuple[float,float], p2: tuple[float,float], p3: tuple[float,float]):
+    x1, y1, x2, y2, x3, y3 = *p1, *p2, *p3
+    diff = (y3-y2)*(x2-x1) - (y2-y1)*(x3-x2)
+    return COUNTERCLOCKWISE if diff > 0 else (CLOCKWISE if diff < 0 else COLLINEAR)
+
+
+def dist(p1: tuple[float,float], p2: tuple[float,float]):
+    x1, y1, x2, y2 = *p1, *p2
+    return math.sqrt((y2-y1)**2 + (x2-x1)**2)
+
+
+def polar_angle(p1: tuple[float,float], p2: tuple[float,float]):
+    dy = p1[1] - p2[1]
+    dx = p1[0] - p2[0]
+    return math.atan2(dy, dx)
+
+    
+def graham_scan(points: list[tuple[float,float]], trace: Tracer=None):
+
+    assert isinstance(points, list) and len(points) > 2, "points must be a list of size > 2"
+    assert all([
+        isinstance(p, tuple) 
+        and len(p) == 2 
+        and isinstance(p[0], (int, float))
+        and isinstance(p[1], (int, float))
+        for p in points
+    ]), "a point must be a tuple of 2 numbers"
+
+    p0 = min(points, key=lambda p: (p[1], p[0]))
+    if trace is not None:
+        trace(Step('pivot', (p0,)))
+    points.sort(key=lambda p: (polar_angle(p, p0), dist(p, p0)))
+    if trace is not None:
+        trace(Step('sort', (points,)))
+
+    hull = [p0]
+    for i in range(1, len(points)):
+        turn = orientation(hull[-2], hull[-1], points[i]) if len(hull) >= 2 else None
+        if trace is not None:
+            trace(Step('consider', (points[i], turn)))
+        while turn is not None and turn != COUNTERCLOCKWISE:
+            popped = hull.pop()
+            turn = orientation(hull[-2], hull[-1], points[i]) if len(hull) >= 2 else None
+            if trace is not None:
+                trace(Step('pop', (points[i], popped, turn)))
+        hull.append(points[i])
+        if trace is not None:
+            trace(Step('push', (points[i],)))
+
+    if trace is not None:
+        trace(Step('close', (hull,)))
+    return hull
+
+
+def graham_scan_indices(points: npt.ArrayLike) -> np.ndarray:
+    # vectorized graham scan over an (N, 2) array, returns the indices of the hull points
+    # in the same order as graham_scan, without modifying the input
+    pts = np.asarray(points, dtype=np.float64)
+    assert pts.ndim == 2 and pts.shape[1] == 2 and len(pts) > 2, "points must be an (N, 2) array with N > 2"
+
+    x, y = pts[:, 0], pts[:, 1]
+    lowest = np.flatnonzero(y == y.min())
+    p0_idx = lowest[np.argmin(x[lowest])]
+
+    # Akl-Toussaint heuristic: points strictly inside the quadrilateral of extreme points
+    # can't be on the hull, dropping them shrinks the sort and the scan
+    quad = pts[[np.argmin(x), np.argmin(y), np.argmax(x), np.argmax(y)]]
+    inside = np.ones(len(pts), dtype=bool)
+    for (ax, ay), (bx, by) in zip(quad, np.roll(quad, -1, axis=0)):
+        inside &= (bx-ax)*(y-ay) - (by-ay)*(x-ax) > 0
+    candidates = np.flatnonzero(~inside)
+    candidates = candidates[candidates != p0_idx]
+
+    # sort according to the polar angle with p0, or distance if equal angles
+    d = pts[candidates] - pts[p0_idx]
+    order = candidates[np.lexsort((np.sqrt(d[:, 0]**2 + d[:, 1]**2), np.arctan2(d[:, 1], d[:, 0])))]
+
+    xs, ys = x.tolist(), y.tolist()
+    hull = [int(p0_idx)]
+    for i in order.tolist():
+        while len(hull) >= 2 and \
+        (ys[i]-ys[hull[-1]])*(xs[hull[-1]]-xs[hull[-2]]) - (ys[hull[-1]]-ys[hull[-2]])*(xs[i]-xs[hull[-1]]) <= 0:
+            hull.pop()
+        hull.append(i)
+
+    return np.array(hull, dtype=np.intp)
+
+
+if __name__ == '__main__':
+    points = [
+        (5.29, 3.48), (9.75, -1.54), (11.02, -0.28), (10.39, -0.28), (11.02, 0.98), 
+        (8.48, -0.911), (9.75, 1), (9.72, 1.6), (9.12, 2.91), (7.85, 2.29), (7.21, 1.62), 
+        (6.57, 0.36), (4.65, 2.29), (5.29, 0.36), (3.38, 2.91), (4.03, 1), (2.75, 1), (5.29, -1.573), 
+        (3.38, -0.911), (5.94, -2.18), (2.11, -0.911), (4.66, -2.2), (3.38, -2.18), (7.21, -2.782)
+    ]
+    print(graham_scan(points))
+    
\ No newline at end of file
@@ -0,0 +1,22 @@
+from .step_trace import Step, Tracer
+
+
+def linear_search(values: list[any], target: any, trace: Tracer=None):
+    for i in range(len(values)):
+        if trace is not None:
+            trace(Step('move_pointer', (i,)))
+        if values[i] == target:
+            if trace is not None:
+                trace(Step('found', (i,)))
+            return i
+        if trace is not None:
+            trace(Step('mismatch', (i,)))
+    if trace is not None:
+        trace(Step('not_found'))
+    return -1
+
+
+if __name__ == '__main__':
+    values = [4, 1, 8, 6, 3, 0, 4, 9, -5, 3, 7, 10, 7, 5]
+    target = 7
+    print(linear_search(values, target))
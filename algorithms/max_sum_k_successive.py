@@ -0,0 +1,116 @@
+import heapq
+import itertools
+import numpy as np
+import numpy.typing as npt
+from collections import deque
+from typing import Iterable
+from .step_trace import Step, Tracer
+
+
+def max_sum_k_successive(values: list[float], k: int, trace: Tracer=None) -> tuple[int,float]:
+
+    assert isinstance(values, list) and len(values) > 0, "values list can't be empty"
+    assert 1 <= k <= len(values), "k must be between 1 and len(values)"
+
+    curr_sum, max_sum, max_sum_idx = sum(values[:k]), sum(values[:k]), 0
+    if trace is not None:
+        trace(Step('init_window', (curr_sum,)))
+    if trace is not None:
+        trace(Step('compare', (0,)))
+    if trace is not None:
+        trace(Step('new_max', (0, max_sum)))
+    for i in range(1, len(values)-k+1):
+        curr_sum += values[i+k-1] - values[i-1]
+        if trace is not None:
+            trace(Step('slide', (i, curr_sum)))
+        if trace is not None:
+            trace(Step('compare', (i,)))
+        if curr_sum > max_sum:
+            max_sum, max_sum_idx = curr_sum, i
+            if trace is not None:
+                trace(Step('new_max', (i, max_sum)))
+    if trace is not None:
+        trace(Step('done', (max_sum_idx, max_sum)))
+    return max_sum_idx, max_sum
+
+
+def max_sum_k_successive_stream(
+        values: Iterable[float]|Iterable[Iterable[float]],
+        k: int,
+        top_m: int=None,
+        chunked: bool=False
+) -> tuple[int,float]|tuple[int,float,list[tuple[int,float]]]:
+    # same results as max_sum_k_successive on any iterable (or iterable of chunks when chunked),
+    # only the last k values are kept in memory, with top_m the m best windows are also returned
+    # as (start, sum) sorted by decreasing sum then increasing start
+    assert k >= 1, "k must be >= 1"
+    assert top_m is None or top_m >= 1, "top_m must be >= 1"
+    values = iter(itertools.chain.from_iterable(values) if chunked else values)
+
+    window = deque(itertools.islice(values, k), maxlen=k)
+    assert len(window) == k, "values must contain at least k elements"
+    curr_sum = sum(window)
+    max_sum, max_sum_idx = curr_sum, 0
+    # min-heap of (sum, -start), on equal sums the latest window is evicted first
+    top = [(curr_sum, 0)] if top_m else []
+    for i, value in enumerate(values, start=1):
+        curr_sum += value - window[0]
+        window.append(value)
+        if curr_sum > max_sum:
+            max_sum, max_sum_idx = curr_sum, i
+        if top_m:
+            if len(top) < top_m:
+                heapq.heappush(top, (curr_sum, -i))
+            elif (curr_sum, -i) > top[0]:
+                heapq.heapreplace(top, (curr_sum, -i))
+
+    if top_m is None:
+        return max_sum_idx, max_sum
+    return max_sum_idx, max_sum, [(-start, window_sum) for window_sum, start in sorted(top, reverse=True)]
+
+
+def max_sum_k_successive_batch(
+        series: npt.ArrayLike, k: int|list[int]
+) -> tuple[np.ndarray|int, np.ndarray|float]:
+    # best window of every row of an (R, N) array (or a single 1-D series) for one or several k,
+    # returns (starts, sums) of shape (R, len(k)), the axes given as scalars/1-D are dropped and a single
+    # series with a single k gives plain numbers, ties go to the earliest window like max_sum_k_successive
+    values = np.asarray(series)
+    assert values.ndim in (1, 2) and values.shape[-1] > 0, "series must be a non-empty 1-D or 2-D array"
+    ks = np.atleast_1d(np.asarray(k, dtype=np.intp))
+    assert ks.ndim == 1 and np.all((ks >= 1) & (ks <= values.shape[-1])), "k must be between 1 and len(values)"
+    rows = np.atleast_2d(values)
+    if np.issubdtype(rows.dtype, np.integer) or rows.dtype == bool:
+        # integer prefix sums are exact
+        rows = rows.astype(np.int64)
+        centered = rows
+    else:
+        # prefix sums of large floats lose the small differences between windows, centering each row
+        # keeps the prefix sums small, the winning sums are then recomputed from the original values
+        rows = rows.astype(np.float64)
+        centered = rows - rows.mean(axis=1, keepdims=True)
+    num_rows, n = rows.shape
+    prefix = np.zeros((num_rows, n+1), dtype=centered.dtype)
+    np.cumsum(centered, axis=1, out=prefix[:, 1:])
+
+    starts = np.empty((num_rows, len(ks)), dtype=np.intp)
+    sums = np.empty((num_rows, len(ks)), dtype=rows.dtype)
+    row_idx = np.arange(num_rows)[:, None]
+    for j, window in enumerate(ks.tolist()):
+        best = np.argmax(prefix[:, window:] - prefix[:, :-window], axis=1)
+        starts[:, j] = best
+        sums[:, j] = rows[row_idx, best[:, None] + np.arange(window)].sum(axis=1)
+
+    if values.ndim == 1:
+        starts, sums = starts[0], sums[0]
+    if np.ndim(k) == 0:
+        starts, sums = starts[..., 0], sums[..., 0]
+    if values.ndim == 1 and np.ndim(k) == 0:
+        return starts.item(), sums.item()
+    return starts, sums
+
+
+if __name__ == '__main__':
+    values = [5, 2, 8, 0, 5, 100, 2, 8, 3, 80, 2, 44, 2]
+    k = 4
+    print(max_sum_k_successive(values, k))
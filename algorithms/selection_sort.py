@@ -0,0 +1,13 @@
+def selection_sort(values: list[any]):
+    for i in range(len(values)):
+        min_idx = i
+        for j in range(i+1, len(values)):
+            if values[j] < values[min_idx]:
+                min_idx = j
+        values[i], values[min_idx] = values[min_idx], values[i]
+    return values
+
+
+if __name__ == '__main__':
+    values = [4, 10, -3, 5, 200, 0, 4, 8, 9, 4, 12]
+    print(selection_sort(values))
@@ -0,0 +1,56 @@
+from typing import Callable, NamedTuple
+
+
+class Step(NamedTuple):
+    kind: str
+    args: tuple = ()
+
+
+Tracer = Callable[[Step], None]
+
+
+def record(func: Callable, *args, **kwargs) -> tuple[any, list[Step]]:
+    # runs a pure algorithm with tracing enabled, returns its result and its steps
+    steps = []
+    return func(*args, trace=steps.append, **kwargs), steps
+
+
+def split_steps(steps: list[Step], num_segments: int, boundary_kind: str=None) -> list[tuple[int, int|None]]:
+    # splits a trace into at most num_segments [start, stop) ranges, cutting only in front of
+    # steps of boundary_kind (loop iteration starts) when given, the last range is open-ended
+    boundaries = [n for n, step in enumerate(steps) if boundary_kind is None or step.kind == boundary_kind]
+    boundaries = [n for n in boundaries if n > 0]
+    num_cuts = min(num_segments-1, len(boundaries))
+    cuts = [boundaries[round((c+1)*len(boundaries)/(num_cuts+1)) - 1] for c in range(num_cuts)]
+    cuts = sorted(set(cuts))
+    starts = [0] + cuts
+    return list(zip(starts, cuts + [None]))
+
+
+def pacing_plan(
+        steps: list[Step],
+        iteration_kind: str,
+        detailed_iterations: int,
+        interesting_kinds: set[str]=frozenset(),
+        growth: float=2.0,
+        min_speed: float=0.25
+) -> list[float]:
+    # speed of every step when rendering a trace: the first detailed_iterations loop iterations play
+    # at full speed (1.0), the next ones are grouped in batches growing by growth where only the last
+    # iteration is played, faster at each batch (down to min_speed), the others are skipped (0.0).
+    # Steps before the first iteration, the last iteration and iterations holding an interesting
+    # step always play at full speed, so the played time grows with the log of the iteration count
+    starts = [n for n, step in enumerate(steps) if step.kind == iteration_kind]
+    speeds = [1.0]*len(steps)
+    iterations = list(zip(starts, starts[1:] + [len(steps)]))[:-1]
+    expanded = [any(step.kind in interesting_kinds for step in steps[a:b]) for a, b in iterations]
+    k, level = detailed_iterations, 1
+    while k < len(iterations):
+        batch = range(k, min(k + round(growth**level), len(iterations)))
+        played = max([i for i in batch if not expanded[i]], default=None)
+        for i in batch:
+            if not expanded[i]:
+                a, b = iterations[i]
+                speeds[a:b] = [max(min_speed, growth**-level) if i == played else 0.0]*(b-a)
+        k, level = batch.stop, level+1
+    return speeds
@@ -0,0 +1,144 @@
+import itertools
+import numpy as np
+import numpy.typing as npt
+from .step_trace import Step, Tracer
+
+
+def two_sum(values: list[float], target: float, trace: Tracer=None, check_sorted: bool=True) -> tuple[int,int]:
+    assert isinstance(values, list) and len(values) > 0 \
+        and all(isinstance(v, (int, float)) for v in values), \
+        'values must be a non-empty list of numbers'
+    assert isinstance(target, (int, float)), 'target must be a number'
+    assert not check_sorted or all(a <= b for a, b in zip(values, itertools.islice(values, 1, None))), \
+        'values must be sorted'
+
+    i, j = 0, len(values)-1
+    while i < j:
+        if trace is not None:
+            trace(Step('move_pointers', (i, j)))
+        if values[i] + values[j] == target:
+            if trace is not None:
+                trace(Step('found', (i, j)))
+            return (i, j)
+        elif values[i] + values[j] < target:
+            if trace is not None:
+                trace(Step('compare', (i, j, '<')))
+            i += 1
+        else:
+            if trace is not None:
+                trace(Step('compare', (i, j, '>')))
+            j -= 1
+    if trace is not None:
+        trace(Step('not_found', (i, j)))
+    return (-1, -1)
+
+
+def _first_sum_at_least(values: np.ndarray, others: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    # for every (other, target), first index i with values[i] + other >= target (len(values) if none)
+    n = len(values)
+    idx = np.searchsorted(values, targets - others, side='left')
+    # targets - others is rounded for floats, the few positions it can be off by are fixed on the actual sums
+    while True:
+        back = (idx > 0) & (values[np.maximum(idx-1, 0)] + others >= targets)
+        forward = ~back & (idx < n) & (values[np.minimum(idx, n-1)] + others < targets)
+        if not (back.any() or forward.any()):
+            return idx
+        idx = idx - back + forward
+
+
+def _last_sum_at_most(values: np.ndarray, others: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    # for every (other, target), last index j with values[j] + other <= target (-1 if none)
+    n = len(values)
+    idx = np.searchsorted(values, targets - others, side='right') - 1
+    while True:
+        forward = (idx < n-1) & (values[np.minimum(idx+1, n-1)] + others <= targets)
+        back = ~forward & (idx >= 0) & (values[np.maximum(idx, 0)] + others > targets)
+        if not (back.any() or forward.any()):
+            return idx
+        idx = idx + forward - back
+
+
+def _pair_sum_table(values: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # every distinct pair sum of the sorted values with the pair two_sum returns for it: two_sum stops
+    # on the lowest first index that has a partner, paired with the highest partner index
+    distinct, first, counts = np.unique(values, return_index=True, return_counts=True)
+    last = first + counts - 1
+    p, q = np.triu_indices(len(distinct))
+    keep = (p < q) | (counts[p] >= 2)
+    p, q = p[keep], q[keep]
+    sums = distinct[p] + distinct[q]
+    order = np.lexsort((-q, p, sums))
+    sums, p, q = sums[order], p[order], q[order]
+    head = np.ones(len(sums), dtype=bool)
+    head[1:] = sums[1:] != sums[:-1]
+    return sums[head], first[p[head]], last[q[head]]
+
+
+class PairSumTable:
+    # the pair sum table of sorted values, built once in O(D^2 log D) for D distinct values then every
+    # target is a binary search, worth it for many targets or to share across two_sum_many calls
+    def __init__(self, values: npt.ArrayLike, check_sorted: bool=True):
+        values = np.asarray(values)
+        assert values.ndim == 1 and len(values) > 0, 'values must be a non-empty 1-D array of numbers'
+        assert not check_sorted or bool(np.all(values[:-1] <= values[1:])), 'values must be sorted'
+        self.sums, self.first, self.second = _pair_sum_table(values)
+
+    def lookup(self, targets: npt.ArrayLike) -> np.ndarray:
+        targets = np.asarray(targets)
+        result = np.full((len(targets), 2), -1, dtype=np.intp)
+        if len(self.sums) == 0:
+            return result
+        idx = np.minimum(np.searchsorted(self.sums, targets), len(self.sums)-1)
+        found = self.sums[idx] == targets
+        result[found, 0], result[found, 1] = self.first[idx[found]], self.second[idx[found]]
+        return result
+
+
+def two_sum_many(
+        values: npt.ArrayLike,
+        targets: npt.ArrayLike,
+        check_sorted: bool=True,
+        max_pairs: int=1 << 23,
+        table: PairSumTable=None
+) -> np.ndarray:
+    # answers many targets against the same sorted values, returns an (T, 2) array holding for every
+    # target the same pair as two_sum, or (-1, -1) if there is none. A prebuilt table of the same values
+    # is used as is, otherwise one is built when the targets pay for it: about D^2/2 pair sums against
+    # a few binary searches of log n per target for the two pointers
+    values = np.asarray(values)
+    targets = np.asarray(targets)
+    assert values.ndim == 1 and len(values) > 0, 'values must be a non-empty 1-D array of numbers'
+    assert targets.ndim == 1, 'targets must be a 1-D array of numbers'
+    if table is not None:
+        return table.lookup(targets)
+    assert not check_sorted or bool(np.all(values[:-1] <= values[1:])), 'values must be sorted'
+
+    num_distinct = len(np.unique(values))
+    num_pairs = num_distinct*(num_distinct+1)//2
+    if num_pairs <= max_pairs and len(targets)*max(1.0, np.log2(len(values))) >= num_pairs:
+        return PairSumTable(values, check_sorted=False).lookup(targets)
+
+    result = np.full((len(targets), 2), -1, dtype=np.intp)
+    # otherwise all targets run the two pointers in lockstep, each pointer jumping with a binary
+    # search over a whole run of single steps instead of moving by one
+    active = np.arange(len(targets))
+    i = np.zeros(len(targets), dtype=np.intp)
+    j = np.full(len(targets), len(values)-1, dtype=np.intp)
+    while active.size:
+        ii, jj, tt = i[active], j[active], targets[active]
+        sums = values[ii] + values[jj]
+        found = (ii < jj) & (sums == tt)
+        result[active[found], 0], result[active[found], 1] = ii[found], jj[found]
+        pending = (ii < jj) & ~found
+        active, ii, jj, tt, sums = active[pending], ii[pending], jj[pending], tt[pending], sums[pending]
+        low, high = sums < tt, sums > tt
+        # i moves right while the sum is too small, j moves left while it is too big
+        i[active[low]] = np.minimum(_first_sum_at_least(values, values[jj[low]], tt[low]), jj[low])
+        j[active[high]] = np.maximum(_last_sum_at_most(values, values[ii[high]], tt[high]), ii[high])
+    return result
+
+
+if __name__ == '__main__':
+    values = [1, 4, 5, 5, 8, 12, 15, 16, 25, 36, 37, 40, 42, 43, 66, 71]
+    target = 58
+    print(two_sum(values, target))
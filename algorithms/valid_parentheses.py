@@ -0,0 +1,331 @@
+import mmap
+import os
+import numpy as np
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from typing import NamedTuple
+from .step_trace import Step, Tracer
+
+
+def valid_parentheses(s: str, trace: Tracer=None):
+    stack = []
+    opening_par = {'(', '{', '['}
+    closing_par = {')', '}', ']'}
+    close_open_map = {')': '(', '}': '{', ']': '['}
+
+    assert set(s).issubset(opening_par.union(closing_par)), \
+        "string s must be made of parentheses only (){}[]"
+    
+    for i, par in enumerate(s):
+        if trace is not None:
+            trace(Step('move_pointer', (i,)))
+        if par in opening_par:
+            stack.append(par)
+            if trace is not None:
+                trace(Step('push', (i, par)))
+        elif len(stack) == 0:
+            if trace is not None:
+                trace(Step('empty_stack', (i, par)))
+            return False
+        elif close_open_map[par] != stack[-1]:
+            if trace is not None:
+                trace(Step('mismatch', (i, par, stack[-1])))
+            return False
+        else:
+            stack.pop()
+            if trace is not None:
+                trace(Step('pop', (i, par)))
+    
+    if len(stack) > 0:
+        if trace is not None:
+            trace(Step('unclosed', (len(stack),)))
+    else:
+        if trace is not None:
+            trace(Step('valid'))
+    return len(stack) == 0
+
+
+def first_error(s: str) -> int:
+    # position of the character where valid_parentheses fails, len(s) if parentheses are left
+    # unclosed, -1 if s is valid
+    stack = []
+    close_open_map = {')': '(', '}': '{', ']': '['}
+    assert set(s).issubset({'(', '{', '['}.union(close_open_map)), \
+        "string s must be made of parentheses only (){}[]"
+    for i, par in enumerate(s):
+        if par not in close_open_map:
+            stack.append(par)
+        elif len(stack) == 0 or close_open_map[par] != stack.pop():
+            return i
+    return len(s) if stack else -1
+
+
+OPENERS, CLOSERS = b'([{', b')]}'
+
+
+class _Positions(NamedTuple):
+    # positions of head followed by those of tail from index skip on, moved by shift, so that
+    # concatenating positions is O(1) and reading one walks down the concatenations
+    head: "_Positions|array"
+    tail: "_Positions|array"
+    skip: int
+    shift: int
+    length: int
+
+
+def _count(positions: _Positions|array) -> int:
+    return positions.length if isinstance(positions, _Positions) else len(positions)
+
+
+def _position(positions: _Positions|array, k: int) -> int:
+    shift = 0
+    while isinstance(positions, _Positions):
+        head_length = _count(positions.head)
+        if k < head_length:
+            positions = positions.head
+        else:
+            k += positions.skip - head_length
+            shift += positions.shift
+            positions = positions.tail
+    return positions[k] + shift
+
+
+class BracketSummary(NamedTuple):
+    # reduction of a chunk: the closers it leaves unmatched with their positions (stored as the openers
+    # they close), the openers left on its stack (innermost first) and the position of the first mismatch
+    # inside it (-1 if none), summaries of consecutive chunks are merged with combine_brackets. Positions
+    # are relative to offset, so moving a summary only changes offset, they are applied when the first
+    # error is resolved
+    closer_pos: _Positions|array
+    closers: bytes
+    openers: bytes
+    failure: int = -1
+    offset: int = 0
+
+
+def summarize_brackets(chunk: bytes, offset: int=0) -> BracketSummary:
+    assert not chunk.translate(None, OPENERS + CLOSERS), "string s must be made of parentheses only (){}[]"
+    opening = set(OPENERS)
+    close_open_map = dict(zip(CLOSERS, OPENERS))
+    closer_pos, closers, stack = array('q'), bytearray(), bytearray()
+    push, pop = stack.append, stack.pop
+    for i, par in enumerate(chunk):
+        if par in opening:
+            push(par)
+        elif stack:
+            if close_open_map[par] != pop():
+                return BracketSummary(closer_pos, bytes(closers), bytes(stack[::-1]), i, offset)
+        else:
+            closer_pos.append(i)
+            closers.append(close_open_map[par])
+    return BracketSummary(closer_pos, bytes(closers), bytes(stack[::-1]), -1, offset)
+
+
+def combine_brackets(first: BracketSummary, second: BracketSummary) -> BracketSummary:
+    # summary of first followed by second, associative, in O(1) apart from the bracket bytes
+    if first.failure >= 0:
+        return first
+    shift = second.offset - first.offset
+    failure = second.failure + shift if second.failure >= 0 else -1
+    # the unmatched closers of second pop the openers of first, innermost first
+    n = min(len(second.closers), len(first.openers))
+    if second.closers[:n] != first.openers[:n]:
+        mismatch = np.flatnonzero(
+            np.frombuffer(second.closers, np.uint8, n) != np.frombuffer(first.openers, np.uint8, n)
+        )[0]
+        return first._replace(failure=_position(second.closer_pos, mismatch) + shift)
+    if len(second.closers) > n:
+        # the openers of first ran out, the remaining closers are left for whatever precedes first
+        closer_pos = _Positions(
+            first.closer_pos, second.closer_pos, n, shift, len(first.closers) + len(second.closers) - n
+        )
+        return BracketSummary(
+            closer_pos, first.closers + second.closers[n:], second.openers, failure, first.offset
+        )
+    return first._replace(openers=second.openers + first.openers[n:], failure=failure)
+
+
+def resolve_brackets(summary: BracketSummary, length: int) -> int:
+    # same result as first_error for the whole string summarized
+    if summary.closers:
+        return summary.offset + _position(summary.closer_pos, 0)
+    if summary.failure >= 0:
+        return summary.offset + summary.failure
+    return length if summary.openers else -1
+
+
+def _summarize_file_range(path: str, start: int, stop: int) -> BracketSummary:
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        return summarize_brackets(m[start:stop], start)
+
+
+def first_error_file(path: str, chunk_size: int=1 << 26, workers: int=None) -> int:
+    # first_error of the contents of a file, chunks are memory mapped and summarized across a
+    # process pool, then combined in order until the first error is known
+    size = os.path.getsize(path)
+    if size == 0:
+        return -1
+    starts = range(0, size, chunk_size)
+    stops = [min(start+chunk_size, size) for start in starts]
+    total = None
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for summary in pool.map(_summarize_file_range, repeat(path), starts, stops):
+            total = summary if total is None else combine_brackets(total, summary)
+            if total.closers or total.failure >= 0:
+                # nothing after can fail earlier
+                pool.shutdown(cancel_futures=True)
+                break
+    return resolve_brackets(total, size)
+
+
+def _shift_brackets(summary: BracketSummary, offset: int) -> BracketSummary:
+    return summary._replace(offset=summary.offset+offset) if offset else summary
+
+
+_NO_BRACKETS = BracketSummary(array('q'), b'', b'')
+
+
+class BracketDocument:
+    # bracket string supporting edits, the text is kept in blocks of about block_size characters
+    # under a segment tree holding the summary of every range of blocks (positions relative to the
+    # range start), an edit re-summarizes one block and the summaries above it, then the answer
+    # is read at the root. Blocks are laid out with an empty leaf after each one, a block that
+    # overflows is split into the empty leaves that follow it and a block emptied by a delete stays
+    # as an empty leaf, when there is no room the blocks of the smallest subtree that stays half full
+    # are spread again (from their summaries, without reading the text) and the tree only grows when full
+    def __init__(self, s: str='', block_size: int=1024):
+        assert block_size >= 1, "block_size must be >= 1"
+        self.block_size = block_size
+        self._check(s)
+        blocks = [s[i:i+block_size] for i in range(0, len(s), block_size)]
+        self._layout(blocks, [summarize_brackets(block.encode()) for block in blocks])
+
+    @staticmethod
+    def _check(text: str):
+        assert set(text).issubset({'(', ')', '{', '}', '[', ']'}), \
+            "string s must be made of parentheses only (){}[]"
+
+    def _layout(self, blocks: list[str], summaries: list[BracketSummary]):
+        self._size = 1 << max(2*len(blocks)-1, 0).bit_length()
+        self._blocks = ['']*self._size
+        self._len = [0]*(2*self._size)
+        self._sum = [_NO_BRACKETS]*(2*self._size)
+        for k, (block, summary) in enumerate(zip(blocks, summaries)):
+            self._blocks[2*k] = block
+            self._len[self._size+2*k] = len(block)
+            self._sum[self._size+2*k] = summary
+        for node in reversed(range(1, self._size)):
+            self._merge(node)
+
+    def _merge(self, node: int):
+        left, right = 2*node, 2*node+1
+        self._len[node] = self._len[left] + self._len[right]
+        self._sum[node] = combine_brackets(self._sum[left], _shift_brackets(self._sum[right], self._len[left]))
+
+    def _update(self, i: int):
+        node = self._size + i
+        self._len[node] = len(self._blocks[i])
+        self._sum[node] = summarize_brackets(self._blocks[i].encode())
+        node //= 2
+        while node:
+            self._merge(node)
+            node //= 2
+
+    def _locate(self, pos: int) -> tuple[int, int]:
+        # index of the block holding position pos and offset inside it, len(self) maps to the end of the last block
+        if pos >= len(self):
+            return len(self._blocks)-1, len(self._blocks[-1]) - (len(self)-pos)
+        node = 1
+        while node < self._size:
+            node *= 2
+            if pos >= self._len[node]:
+                pos -= self._len[node]
+                node += 1
+        return node - self._size, pos
+
+    def __len__(self) -> int:
+        return self._len[1]
+
+    def __str__(self) -> str:
+        return ''.join(self._blocks)
+
+    def insert(self, pos: int, text: str):
+        assert 0 <= pos <= len(self), "position out of range"
+        self._check(text)
+        i, offset = self._locate(pos)
+        block = self._blocks[i] = self._blocks[i][:offset] + text + self._blocks[i][offset:]
+        if len(block) <= 2*self.block_size:
+            self._update(i)
+            return
+        pieces = [block[j:j+self.block_size] for j in range(0, len(block), self.block_size)]
+        summaries = [summarize_brackets(piece.encode()) for piece in pieces]
+        # the pieces are spread again with the other blocks of the smallest subtree around the block that
+        # stays at most half full, only that subtree and the path above it are merged again
+        lo, hi = i, i+1
+        while hi - lo < self._size:
+            width = 2*(hi - lo)
+            lo = lo//width*width
+            hi = lo + width
+            if sum(map(bool, self._blocks[lo:hi])) - 1 + len(pieces) <= width//2:
+                self._spread(lo, hi, i, pieces, summaries)
+                return
+        # the whole tree is full, its leaves are laid out again in a bigger one
+        blocks = [other for other in self._blocks[:i] if other] + pieces + [other for other in self._blocks[i+1:] if other]
+        summaries = [
+            self._sum[self._size+k] for k in range(i) if self._blocks[k]
+        ] + summaries + [
+            self._sum[self._size+k] for k in range(i+1, self._size) if self._blocks[k]
+        ]
+        self._layout(blocks, summaries)
+
+    def _spread(self, lo: int, hi: int, i: int, pieces: list[str], summaries: list[BracketSummary]):
+        # spreads the blocks of leaves lo..hi, leaf i replaced by pieces, evenly over those leaves
+        blocks, sums = [], []
+        for k in range(lo, hi):
+            if k == i:
+                blocks.extend(pieces)
+                sums.extend(summaries)
+            elif self._blocks[k]:
+                blocks.append(self._blocks[k])
+                sums.append(self._sum[self._size+k])
+        width = hi - lo
+        self._blocks[lo:hi] = ['']*width
+        self._len[self._size+lo:self._size+hi] = [0]*width
+        self._sum[self._size+lo:self._size+hi] = [_NO_BRACKETS]*width
+        for k, (block, summary) in enumerate(zip(blocks, sums)):
+            leaf = lo + k*width//len(blocks)
+            self._blocks[leaf] = block
+            self._len[self._size+leaf] = len(block)
+            self._sum[self._size+leaf] = summary
+        lo, hi = (self._size+lo)//2, (self._size+hi)//2
+        while lo >= 1:
+            for node in range(lo, max(hi, lo+1)):
+                self._merge(node)
+            lo, hi = lo//2, hi//2
+
+    def delete(self, pos: int, length: int=1):
+        # emptied blocks are kept as empty leaves, _locate never stops on them
+        assert 0 <= pos and length >= 0 and pos+length <= len(self), "range out of bounds"
+        while length > 0:
+            i, offset = self._locate(pos)
+            removed = min(length, len(self._blocks[i]) - offset)
+            self._blocks[i] = self._blocks[i][:offset] + self._blocks[i][offset+removed:]
+            self._update(i)
+            length -= removed
+
+    def replace(self, pos: int, text: str):
+        # overwrites len(text) characters from pos
+        self.delete(pos, len(text))
+        self.insert(pos, text)
+
+    def first_error(self) -> int:
+        return resolve_brackets(self._sum[1], len(self))
+
+    def is_valid(self) -> bool:
+        return self.first_error() == -1
+
+
+if __name__ == '__main__':
+    s = '(){}[({(())})](())((})'
+    print(valid_parentheses(s))
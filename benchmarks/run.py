@@ -0,0 +1,187 @@
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from manim import *
+from data_structures.element import Element
+from data_structures.oned_array import Array
+from data_structures.pointer import Pointer
+from data_structures.stack import Stack
+from data_structures.text_cache import text_cache
+
+# construction cost benchmarks for the data structures and the Algorithm scenes:
+#   python -m benchmarks.run run -o baseline.json
+#   python -m benchmarks.run run -o current.json
+#   python -m benchmarks.run compare baseline.json current.json --threshold 0.15
+# every case builds its inputs untimed and returns the operation to time, the text cache
+# is cleared before each repeat so Text rendering is always measured cold
+
+DEFAULT_SIZES = [10, 100, 1000, 10000]
+CASES: dict = {}
+
+
+def case(name: str, sizes: list[int|None]=None):
+    def register(func):
+        CASES[name] = (func, sizes or DEFAULT_SIZES)
+        return func
+    return register
+
+
+@case('element_construct')
+def element_construct(n: int):
+    return lambda: [Element(i, i) for i in range(n)]
+
+
+@case('array_construct')
+def array_construct(n: int):
+    values = list(range(n))
+    return lambda: Array(values)
+
+
+@case('array_append')
+def array_append(n: int):
+    arr = Array(list(range(n)))
+    return lambda: arr.append(-1)
+
+
+@case('array_insert')
+def array_insert(n: int):
+    arr = Array(list(range(n)))
+    return lambda: arr.insert(0, -1)
+
+
+@case('array_pop')
+def array_pop(n: int):
+    arr = Array(list(range(n)))
+    return lambda: arr.pop(0)
+
+
+@case('array_sort')
+def array_sort(n: int):
+    arr = Array(random.Random(n).sample(range(n), n))
+    return lambda: arr.sort()
+
+
+@case('array_shuffle')
+def array_shuffle(n: int):
+    arr = Array(list(range(n)))
+    return lambda: arr.shuffle()
+
+
+@case('array_highlight')
+def array_highlight(n: int):
+    arr = Array(list(range(n)))
+    return lambda: arr.highlight()
+
+
+@case('stack_push')
+def stack_push(n: int):
+    stack = Stack([])
+    return lambda: [stack.push(i) for i in range(n)]
+
+
+@case('stack_pop')
+def stack_pop(n: int):
+    stack = Stack(list(range(n)))
+    return lambda: [stack.pop() for _ in range(n)]
+
+
+@case('pointer_point_at')
+def pointer_point_at(n: int):
+    ptr = Pointer(Pointer.triangle, 'i')
+    targets = [Square().shift(RIGHT*i) for i in range(n)]
+    return lambda: [ptr.point_at(t) for t in targets]
+
+
+def _scene_case(module_name: str):
+    def build(n: None):
+        module = __import__(module_name)
+        # plays are skipped and nothing is written, only mobject and animation building is timed
+        def render():
+            with tempconfig({'dry_run': True, 'skip_animations': True, 'disable_caching': True, 'verbosity': 'ERROR'}):
+                module.Algorithm().render()
+        return render
+    return build
+
+
+for _module_name in ['linear_search', 'two_sum', 'max_sum_k_successive', 'valid_parentheses', 'graham_scan']:
+    case(f'scene_{_module_name}', sizes=[None])(_scene_case(_module_name))
+
+
+def run_case(func, n: int|None, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        operation = func(n)
+        text_cache.clear()
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+    return {'best': min(timings), 'mean': statistics.mean(timings), 'repeat': repeat}
+
+
+def run(sizes: list[int], repeat: int, name_filter: str=None) -> dict:
+    results = {}
+    for name, (func, case_sizes) in CASES.items():
+        if name_filter and name_filter not in name:
+            continue
+        for n in case_sizes:
+            if n is not None and n not in sizes:
+                continue
+            key = name if n is None else f'{name}[{n}]'
+            results[key] = run_case(func, n, repeat)
+            print(f"{key:40s} {results[key]['best']*1000:12.3f} ms")
+    return {
+        'meta': {'python': platform.python_version(), 'platform': platform.platform(), 'time': time.time()},
+        'results': results
+    }
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    # a case regresses when its best time grew by more than threshold (relative)
+    regressions = []
+    for key, result in current['results'].items():
+        if key not in baseline['results']:
+            continue
+        before, after = baseline['results'][key]['best'], result['best']
+        ratio = after/before if before > 0 else float('inf')
+        flag = 'REGRESSION' if ratio > 1 + threshold else ''
+        print(f'{key:40s} {before*1000:12.3f} ms -> {after*1000:12.3f} ms  x{ratio:6.2f} {flag}')
+        if flag:
+            regressions.append(key)
+    return regressions
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='data structure and scene construction benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    run_parser = subparsers.add_parser('run', help='run the benchmarks and write a JSON report')
+    run_parser.add_argument('-o', '--output', default='benchmarks/results.json')
+    run_parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    run_parser.add_argument('--repeat', type=int, default=3)
+    run_parser.add_argument('-k', '--filter', default=None, help='only run cases whose name contains this')
+    compare_parser = subparsers.add_parser('compare', help='compare a report against a baseline')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.1)
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        report = run(args.sizes, args.repeat, args.filter)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        with open(args.current) as f:
+            current = json.load(f)
+        regressions = compare(baseline, current, args.threshold)
+        if regressions:
+            print(f'{len(regressions)} regression(s) over {args.threshold:.0%}')
+            sys.exit(1)
@@ -0,0 +1,182 @@
+from manim import *
+import numpy.typing as npt
+from typing_extensions import TypeAlias
+
+
+Vector3D: TypeAlias = npt.NDArray[np.float64]
+
+# animations that interpolate a few numbers (a shift, a scale factor, an angle, colors) and apply them
+# in place on every frame, unlike .animate/MoveToTarget/Transform they never copy the point data of the
+# mobject, neither for a target nor for the starting state.
+# Geometric ones are applied incrementally (the step since the previous frame), so several of them can
+# run on the same mobject at once, e.g. Translate and ScaleAbout on array cells.
+# They are meant to be given mobjects already in the scene, one animation per part: the scene adds the
+# mobject of a played animation it does not know, so a VGroup built for a single animation would stay
+# behind as a new top-level mobject and split the structure its parts belong to
+
+
+class AttributeAnimation(Animation):
+    def __init__(self, mobject: Mobject, **kwargs):
+        super().__init__(mobject, **kwargs)
+        self.last_alpha = 0.0
+
+    def create_starting_mobject(self) -> Mobject:
+        return Mobject()
+
+    def begin(self):
+        self.last_alpha = 0.0
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float):
+        alpha = self.rate_func(alpha)
+        self.step(alpha, self.last_alpha)
+        self.last_alpha = alpha
+
+    def step(self, alpha: float, last_alpha: float):
+        raise NotImplementedError
+
+
+class Translate(AttributeAnimation):
+    # shifts mobject by vector
+    def __init__(self, mobject: Mobject, vector: Vector3D, **kwargs):
+        self.vector = np.asarray(vector, dtype=np.float64)
+        super().__init__(mobject, **kwargs)
+
+    def step(self, alpha: float, last_alpha: float):
+        self.mobject.shift(self.vector*(alpha - last_alpha))
+
+
+class ScaleAbout(AttributeAnimation):
+    # scales mobject by factor about its critical point in about_edge direction (its center by default),
+    # taken again on every frame so it follows a concurrent Translate
+    def __init__(self, mobject: Mobject, factor: float, about_edge: Vector3D=ORIGIN, **kwargs):
+        assert factor > 0, "factor must be positive"
+        self.factor = factor
+        self.about_edge = about_edge
+        super().__init__(mobject, **kwargs)
+
+    def step(self, alpha: float, last_alpha: float):
+        ratio = interpolate(1.0, self.factor, alpha)/interpolate(1.0, self.factor, last_alpha)
+        self.mobject.scale(ratio, about_edge=self.about_edge)
+
+
+class RotateTo(AttributeAnimation):
+    # rotates mobject from from_angle to angle (radians, around OUT) while shifting it by shift, the pivot
+    # is its starting center carried along by the shift so the final pose does not depend on the frames
+    def __init__(
+            self, mobject: Mobject, angle: float, from_angle: float=0.0, shift: Vector3D=ORIGIN, **kwargs
+    ):
+        self.angle = angle - from_angle
+        self.shift = np.asarray(shift, dtype=np.float64)
+        super().__init__(mobject, **kwargs)
+
+    def begin(self):
+        self.pivot = self.mobject.get_center()
+        super().begin()
+
+    def step(self, alpha: float, last_alpha: float):
+        self.mobject.shift(self.shift*(alpha - last_alpha))
+        self.mobject.rotate(self.angle*(alpha - last_alpha), about_point=self.pivot + self.shift*alpha)
+
+
+class Recolor(AttributeAnimation):
+    # interpolates fill and stroke of every VMobject of the family from their current values,
+    # color sets both fill and stroke color like set_color, None leaves an attribute untouched
+    def __init__(
+            self,
+            mobject: Mobject,
+            color: ParsableManimColor=None,
+            fill_color: ParsableManimColor=None,
+            fill_opacity: float=None,
+            stroke_color: ParsableManimColor=None,
+            stroke_width: float=None,
+            stroke_opacity: float=None,
+            **kwargs
+    ):
+        fill_color = fill_color if fill_color is not None else color
+        stroke_color = stroke_color if stroke_color is not None else color
+        self.fill_color = ManimColor(fill_color) if fill_color is not None else None
+        self.stroke_color = ManimColor(stroke_color) if stroke_color is not None else None
+        self.fill_opacity, self.stroke_width, self.stroke_opacity = fill_opacity, stroke_width, stroke_opacity
+        super().__init__(mobject, **kwargs)
+
+    def begin(self):
+        self.mobs, self.starts = family_styles(self.mobject)
+        self.ends = self.starts.copy()
+        for columns, value in [
+            (slice(0, 3), self.fill_color.to_rgb() if self.fill_color is not None else None),
+            (3, self.fill_opacity),
+            (slice(4, 7), self.stroke_color.to_rgb() if self.stroke_color is not None else None),
+            (7, self.stroke_width),
+            (8, self.stroke_opacity)
+        ]:
+            if value is not None:
+                self.ends[:, columns] = value
+        super().begin()
+
+    def step(self, alpha: float, last_alpha: float):
+        interpolate_styles(self.mobs, self.starts, self.ends, alpha)
+
+
+class Reveal(AttributeAnimation):
+    # hides mobject right away and brings its current fill and stroke back when played, for mobjects that
+    # must already be part of their structure but only appear later in a Succession
+    def __init__(self, mobject: Mobject, **kwargs):
+        self.mobs, self.styles = family_styles(mobject)
+        mobject.set_opacity(0)
+        super().__init__(mobject, **kwargs)
+
+    def begin(self):
+        self.starts = style_array(self.mobs)
+        super().begin()
+
+    def step(self, alpha: float, last_alpha: float):
+        interpolate_styles(self.mobs, self.starts, self.styles, alpha)
+
+
+def family_styles(mobject: Mobject) -> tuple[list[VMobject], np.ndarray]:
+    # the VMobjects of the family and their style_array
+    mobs = [mob for mob in mobject.get_family() if isinstance(mob, VMobject)]
+    return mobs, style_array(mobs)
+
+
+def style_array(mobs: list[VMobject]) -> np.ndarray:
+    # (M, 9) array of fill rgb, fill opacity, stroke rgb, stroke width and stroke opacity of every mob,
+    # manim gives None for the color of a fully transparent black fill or stroke
+    return np.array([
+        [
+            *(mob.get_fill_color() or BLACK).to_rgb(), mob.get_fill_opacity(),
+            *(mob.get_stroke_color() or BLACK).to_rgb(), mob.get_stroke_width(), mob.get_stroke_opacity()
+        ] for mob in mobs
+    ], dtype=np.float64).reshape(len(mobs), 9)
+
+
+def interpolate_styles(mobs: list[VMobject], starts: np.ndarray, ends: np.ndarray, alpha: float):
+    # applies the styles interpolated between two style_array of mobs
+    for mob, style in zip(mobs, starts + (ends - starts)*alpha):
+        mob.set_fill(ManimColor(style[0:3]), style[3], family=False)
+        mob.set_stroke(ManimColor(style[4:7]), style[7], style[8], family=False)
+
+
+def next_to_vector(
+        mobject: Mobject,
+        target: Mobject|Vector3D,
+        direction: Vector3D=RIGHT,
+        buff: float=DEFAULT_MOBJECT_TO_MOBJECT_BUFFER
+) -> Vector3D:
+    # the shift mobject.next_to(target, direction, buff) would apply, without moving anything
+    target_point = target.get_critical_point(direction) if isinstance(target, Mobject) else np.asarray(target)
+    return target_point - mobject.get_critical_point(-direction) + buff*np.asarray(direction)
+
+
+class TestAnimations(Scene):
+    def construct(self):
+        squares = VGroup(*[Square(0.5) for _ in range(8)]).arrange(RIGHT, buff=0.2)
+        self.play(Create(squares))
+        self.play(Recolor(squares, fill_color=BLUE, fill_opacity=0.8, stroke_color=YELLOW))
+        self.play(
+            *[Translate(square, UP*(i % 3)) for i, square in enumerate(squares)],
+            *[ScaleAbout(square, 1.5, about_edge=DOWN) for square in squares]
+        )
+        self.play(RotateTo(squares[0], PI/4, shift=DOWN*2))
+        self.wait()
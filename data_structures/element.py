@@ -1,6 +1,8 @@
 from manim import *
 import numpy.typing as npt
 from typing_extensions import TypeAlias
+from .animations import AttributeAnimation, family_styles, interpolate_styles, style_array
+from .text_cache import cached_text
 
 
 Vector3D: TypeAlias = npt.NDArray[np.float64]
@@ -20,27 +22,69 @@ class Element(VGroup):
     ):
         super().__init__()
         self.value = value
+        self.box_style = box_style
         self.box = box_style.copy()
         self.content_style = {'font_size': 32}
         self.content_style.update(content_style)
-        value_to_text = {float('inf'): '∞', float('-inf'): '-∞'}
-        self.content = Text(str(value_to_text.get(value, value)), **self.content_style).move_to(self.box.get_center() + content_direction)
-        self.content.scale_to_fit_width(min(self.content.width, self.box.width*0.8))
+        self.content_direction = content_direction
+        self.content = self._make_content(value)
         self.label_style = {'font': 'Consolas', 'font_size': 24, 'color': BLUE}
         self.label_style.update(label_style)
         self.label_direction = label_direction
-        self.label = Text(str(label), **self.label_style)
+        self.label_buff = label_buff
+        self.fit_label_to_width = fit_label_to_width
+        self.label = self._make_label(label)
         self.show_label = label is not None
-        if fit_label_to_width:
-            self.label.scale_to_fit_width(min(self.label.width, self.box.width))
-        self.label.next_to(self.box, label_direction, label_buff)
         self.add(self.box, self.content, [self.label] if self.show_label else [])
 
+    def _make_content(self, value: any) -> Text:
+        value_to_text = {float('inf'): '∞', float('-inf'): '-∞'}
+        content = cached_text(value_to_text.get(value, value), **self.content_style).move_to(
+            self.box.get_center() + self.content_direction
+        )
+        return content.scale_to_fit_width(min(content.width, self.box.width*0.8))
+
+    def _make_label(self, label: any) -> Text:
+        label = cached_text(label, **self.label_style)
+        if self.fit_label_to_width:
+            label.scale_to_fit_width(min(label.width, self.box.width))
+        return label.next_to(self.box, self.label_direction, self.label_buff)
+
+    def _swap(self, old: Mobject, new: Mobject) -> Mobject:
+        if old in self.submobjects:
+            self.submobjects[self.submobjects.index(old)] = new
+        return new
+
+    def set_label(self, label: Mobject|None) -> "Element":
+        # reparents an existing label mobject (or detaches the current one with None), nothing is
+        # rendered, used to keep positional labels in place while elements move around them
+        if self.show_label:
+            self.remove(self.label)
+        if label is not None:
+            self.label = label
+            self.add(label)
+        self.show_label = label is not None
+        return self
+
+    def body(self) -> VGroup:
+        return VGroup(self.box, self.content)
+
+    def rebind(self, value: any, label: any=None):
+        # instantly points this element at a new value and label with the default style,
+        # used to recycle elements instead of creating new ones
+        self.value = value
+        self.box = self._swap(self.box, self.box_style.copy().move_to(self.box))
+        self.content = self._swap(self.content, self._make_content(value))
+        self.label = self._swap(self.label, self._make_label(label))
+        if getattr(self, 'style_snapshot', None) is not None:
+            self.style_snapshot = self.snapshot_style()
+        return self
+
     def replace_value(self, new_value: any):
         self.value = new_value
         self.content.text = str(new_value)
-        return Transform(self.content, Text(
-            str(new_value), **self.content_style).move_to(self.content)
+        return Transform(self.content, cached_text(
+            new_value, **self.content_style).move_to(self.content)
         )
 
     def highlight(
@@ -54,21 +98,17 @@ class Element(VGroup):
             shift: Vector3D=ORIGIN,
             restore: bool=True
     ):
-        self.save_state()
-        anim_group = AnimationGroup(
-            self.box.animate.set_z_index(float('inf')).set_fill(
-                color, fill_opacity
-            ).set_stroke(color=stroke_color).scale(scale_ratio).shift(shift),
-            self.content.animate.set_z_index(float('inf')).set_color(
-                font_color
-            ).scale(scale_ratio).shift(shift),
-            [self.label.animate.set_z_index(float('inf')).set_color(
-                label_color
-            ).scale(scale_ratio).shift(shift + self.label_direction*(scale_ratio-1)*1.5)] if self.show_label else []
-        )
-        return Succession(
-            anim_group, *[Wait(0.2), Restore(self)] if restore else []
+        return highlight_elements(
+            [self], color, stroke_color, font_color, label_color, fill_opacity, scale_ratio, shift, restore
         )
+
+    def snapshot_style(self) -> "StyleSnapshot":
+        return StyleSnapshot(self.box, self.content, self.label if self.show_label else None, self.z_index)
+
+    def restore(self) -> Animation:
+        # brings the element back to its style and geometry before the last highlight
+        assert getattr(self, 'style_snapshot', None) is not None, "element must be highlighted before being restored"
+        return RestoreStyle(self, [self])
     
     def compare(
             self, 
@@ -92,6 +132,167 @@ class Element(VGroup):
             ])
     
 
+def select_elements(elems: list[Element], indices: slice|range|list[int]|list[bool]=None) -> list[Element]:
+    # indices can be a slice, a list of positions or a boolean mask over elems
+    if indices is None:
+        return list(elems)
+    if isinstance(indices, slice):
+        return list(elems[indices])
+    indices = np.asarray(indices)
+    if indices.dtype == bool:
+        assert len(indices) == len(elems), "a mask must have one entry per element"
+        indices = np.flatnonzero(indices)
+    return [elems[i] for i in indices.tolist()]
+
+
+def highlight_elements(
+        elems: list[Element],
+        color: ParsableManimColor=YELLOW,
+        stroke_color: ParsableManimColor=YELLOW,
+        font_color: ParsableManimColor=BLACK,
+        label_color: ParsableManimColor=YELLOW,
+        fill_opacity: float=0.8,
+        scale_ratio: float=1.2,
+        shift: Vector3D=ORIGIN,
+        restore: bool=True,
+        owner: Mobject=None
+) -> Animation:
+    # highlights all elems with a single animation on owner, the Array or Stack holding them (the element
+    # itself for one element), each element keeps a snapshot of the attributes changed here so
+    # elem.restore() can bring them back, nothing is copied
+    if not elems:
+        return Wait(0.5)
+    for elem in elems:
+        elem.style_snapshot = elem.snapshot_style()
+        elem.set_z_index(float('inf'))
+    highlight = HighlightStyle(
+        _owner(elems, owner), elems, color, stroke_color, font_color, label_color, fill_opacity, scale_ratio, shift
+    )
+    return Succession(highlight, Wait(0.2), restore_elements(elems, owner)) if restore else highlight
+
+
+def _owner(elems: list[Element], owner: Mobject|None) -> Mobject:
+    # the animated mobject must already be in the scene, a group built here would be added to it
+    assert owner is not None or len(elems) == 1, "several elements need the Array or Stack holding them as owner"
+    return owner if owner is not None else elems[0]
+
+
+class HighlightStyle(AttributeAnimation):
+    # the styles of every part of elems are captured in one array in begin and interpolated together,
+    # every part is also scaled about its center and shifted (labels move away from the scaled box)
+    def __init__(
+            self,
+            owner: Mobject,
+            elems: list[Element],
+            color: ParsableManimColor,
+            stroke_color: ParsableManimColor,
+            font_color: ParsableManimColor,
+            label_color: ParsableManimColor,
+            fill_opacity: float,
+            scale_ratio: float,
+            shift: Vector3D,
+            **kwargs
+    ):
+        self.elems = elems
+        self.box_style = [*ManimColor(color).to_rgb(), fill_opacity, *ManimColor(stroke_color).to_rgb()]
+        self.font_color, self.label_color = ManimColor(font_color).to_rgb(), ManimColor(label_color).to_rgb()
+        self.scale_ratio = scale_ratio
+        self.shift = np.asarray(shift, dtype=np.float64)
+        super().__init__(owner, **kwargs)
+
+    def begin(self):
+        self.mobs, self.parts, ends, shifts = [], [], [], []
+        for elem in self.elems:
+            parts = [elem.box, elem.content] + ([elem.label] if elem.show_label else [])
+            for part in parts:
+                mobs, styles = family_styles(part)
+                if part is elem.box:
+                    styles[:, 0:7] = self.box_style
+                    shifts.append(self.shift)
+                elif part is elem.content:
+                    styles[:, [0, 1, 2]] = styles[:, [4, 5, 6]] = self.font_color
+                    shifts.append(self.shift)
+                else:
+                    styles[:, [0, 1, 2]] = styles[:, [4, 5, 6]] = self.label_color
+                    shifts.append(self.shift + elem.label_direction*(self.scale_ratio-1)*1.5)
+                self.mobs.extend(mobs)
+                self.parts.append(part)
+                ends.append(styles)
+        self.ends = np.concatenate(ends)
+        self.starts = style_array(self.mobs)
+        self.shifts = np.array(shifts, dtype=np.float64).reshape(len(self.parts), 3)
+        super().begin()
+
+    def step(self, alpha: float, last_alpha: float):
+        interpolate_styles(self.mobs, self.starts, self.ends, alpha)
+        ratio = interpolate(1.0, self.scale_ratio, alpha)/interpolate(1.0, self.scale_ratio, last_alpha)
+        for part, shift in zip(self.parts, self.shifts*(alpha - last_alpha)):
+            if ratio != 1:
+                part.scale(ratio)
+            part.shift(shift)
+
+
+class StyleSnapshot:
+    # the attributes highlight changes on an element: fill and stroke of every part (and of their
+    # family, a StackElement box is a group), center, size and z-index of every part, a few numbers
+    # and colors instead of a copy of the element
+    def __init__(self, box: VMobject, content: VMobject, label: VMobject=None, z_index: float=0):
+        self.z_index = z_index
+        self.parts = [box, content] + ([label] if label is not None else [])
+        self.styles = [family_styles(part) for part in self.parts]
+        self.geometry = [(part.get_center(), _size(part), part.z_index) for part in self.parts]
+
+
+def _size(mob: Mobject) -> float:
+    return max(mob.width, mob.height)
+
+
+class RestoreStyle(AttributeAnimation):
+    # interpolates the snapshotted attributes of elems back from their current values in place, with
+    # one animation on owner whatever the number of elements
+    def __init__(self, owner: Mobject, elems: list[Element], **kwargs):
+        self.elems = elems
+        self.snapshots = [elem.style_snapshot for elem in elems]
+        super().__init__(owner, **kwargs)
+
+    def begin(self):
+        # current values of the same parts, even if an element changed its label since
+        self.mobs = [mob for snapshot in self.snapshots for mobs, _ in snapshot.styles for mob in mobs]
+        self.parts = [part for snapshot in self.snapshots for part in snapshot.parts]
+        self.starts = style_array(self.mobs)
+        self.ends = np.concatenate([styles for snapshot in self.snapshots for _, styles in snapshot.styles])
+        self.start_centers = np.array([part.get_center() for part in self.parts]).reshape(len(self.parts), 3)
+        self.start_sizes = np.array([_size(part) for part in self.parts])
+        geometry = [geometry for snapshot in self.snapshots for geometry in snapshot.geometry]
+        self.end_centers = np.array([center for center, _, _ in geometry]).reshape(len(self.parts), 3)
+        self.end_sizes = np.array([size for _, size, _ in geometry])
+        super().begin()
+
+    def step(self, alpha: float, last_alpha: float):
+        interpolate_styles(self.mobs, self.starts, self.ends, alpha)
+        centers = self.start_centers + (self.end_centers - self.start_centers)*alpha
+        sizes = self.start_sizes + (self.end_sizes - self.start_sizes)*alpha
+        for part, center, size in zip(self.parts, centers, sizes):
+            current_size = _size(part)
+            if current_size > 0:
+                part.scale(size/current_size)
+            part.move_to(center)
+
+    def finish(self):
+        super().finish()
+        for elem, snapshot in zip(self.elems, self.snapshots):
+            elem.set_z_index(snapshot.z_index, family=False)
+            for part, (_, _, z_index) in zip(snapshot.parts, snapshot.geometry):
+                part.set_z_index(z_index)
+
+
+def restore_elements(elems: list[Element], owner: Mobject=None) -> Animation:
+    # brings all elems back to their style before their last highlight with one animation on owner
+    assert all(getattr(elem, 'style_snapshot', None) is not None for elem in elems), \
+        "elements must be highlighted before being restored"
+    return RestoreStyle(_owner(elems, owner), elems) if elems else Wait(0.5)
+
+
 class TestElement(Scene):
     def construct(self):
         elem = Element(45).shift(UP)
@@ -1,8 +1,12 @@
 from manim import *
+import difflib
 import random
+from collections import defaultdict, deque
 import numpy.typing as npt
 from typing_extensions import TypeAlias
-from .element import Element
+from .animations import Reveal, Translate, next_to_vector
+from .element import Element, highlight_elements, restore_elements, select_elements
+from .text_cache import cached_text
         
 Vector3D: TypeAlias = npt.NDArray[np.float64]
 
@@ -32,42 +36,51 @@ class Array(VGroup):
         super().__init__()
         self.values: list = values
         self.n = len(values)
+
+        # layout is computed up front so that cells and fonts are built once at their final size, the
+        # width is the row of boxes (index labels fit in their box) plus the overhang of the array label,
+        # the styles are per-instance copies so the shared defaults are never mutated
+        self.label = cached_text(array_label, **array_label_style)
+        box_width, label_width = box_style.width, self.label.width if array_label else 0.0
+        row_width = self.n*box_width + (self.n-1)*inter_elem_buff
+        if array_label_direction[0] < 0:
+            width = row_width + array_label_buff + label_width
+        elif array_label_direction[0] > 0:
+            width = max(row_width, box_width + array_label_buff + label_width)
+        else:
+            width = row_width + max(0.0, label_width - box_width)
+        ratio = min(1.0, max_width/width)
+        self.box_style = box_style.copy().scale(ratio)
+        self.content_style = {**content_style, 'font_size': content_style.get('font_size', 32)*ratio}
+        self.label_style = {**label_style, 'font_size': label_style.get('font_size', 24)*ratio}
+        self.content_direction = content_direction*ratio
+        self.label_direction, self.label_buff = label_direction, label_buff*ratio
+        self.inter_elem_buff = inter_elem_buff*ratio
+        self.array_center = array_center
+        self.array_label_direction, self.array_label_buff = array_label_direction, array_label_buff*ratio
+        self.add_indices = add_indices
+        self.max_width = max_width
+
         self.elems = [
             Element(
                 v, 
                 i if add_indices else None, 
-                box_style, 
-                content_style,
-                content_direction,
-                label_style,
-                label_direction,
-                label_buff
+                self.box_style, 
+                self.content_style,
+                self.content_direction,
+                self.label_style,
+                self.label_direction,
+                self.label_buff
             ) for i, v in enumerate(values)
         ]
-        VGroup(self.elems).arrange(RIGHT, buff=inter_elem_buff).move_to(array_center)
-        self.label = Text(
-            str(array_label), **array_label_style
-        ).next_to(self.elems[0], array_label_direction, array_label_buff)
-        self.array_center = array_center
-        self.array_label_direction, self.array_label_buff = array_label_direction, array_label_buff
-        self.inter_elem_buff = inter_elem_buff
-        self.add_indices = add_indices
-        self.max_width = max_width
-        self.box_style = box_style
-        self.content_style, self.content_direction = content_style, content_direction
-        self.label_style, self.label_direction, self.label_buff = label_style, label_direction, label_buff
+        # the row is centered on array_center, vertically with the index labels included
+        step = self.box_style.width + self.inter_elem_buff
+        first = array_center + LEFT*(self.n-1)*step/2 + UP*(self.elems[0].box.get_y() - self.elems[0].get_y())
+        for i, elem in enumerate(self.elems):
+            elem.shift(first + RIGHT*i*step - elem.box.get_center())
+        self.label.scale(ratio).next_to(self.elems[0], array_label_direction, self.array_label_buff)
         self.add([self.label] if array_label else [], self.elems)
-        old_width = self.width
-        self.scale_to_fit_width(min(self.width, max_width))
-        self._update_styles_after_scaling(self.width/old_width)
-
-    def _update_styles_after_scaling(self, ratio: float):
-        self.box_style.scale(ratio)
-        self.content_style['font_size'] = self.content_style.get('font_size', 32)*ratio
-        self.label_style['font_size'] = self.label_style.get('font_size', 24)*ratio
-        self.label_buff *= ratio
-        self.inter_elem_buff *= ratio
-    
+
     def append(self, value: any):
         self.values.append(value)
         self.n += 1
@@ -85,11 +98,12 @@ class Array(VGroup):
         self.add(new_elem)
         return Succession([
             Create(new_elem),
-            new_elem.animate.next_to(
+            Translate(new_elem, next_to_vector(
+                new_elem,
                 self.elems[-2] if self.n > 1 else self.label, 
                 RIGHT if self.n > 1 else -self.array_label_direction, 
                 self.inter_elem_buff if self.n > 1 else self.array_label_buff
-            )
+            ))
         ])
         
     def insert(self, idx: int, value: any):
@@ -102,9 +116,10 @@ class Array(VGroup):
         else:
             self.values.insert(idx, value)
             self.n += 1
+            step = RIGHT*(self.elems[idx].box.width + self.inter_elem_buff)
             new_elem = Element(
                 value, 
-                idx if self.add_indices else None, 
+                None, 
                 self.box_style, 
                 self.content_style,
                 self.content_direction,
@@ -112,23 +127,22 @@ class Array(VGroup):
                 self.label_direction,
                 self.label_buff
             ).next_to(self.elems[idx], UP, buff=1.0)
+            new_elem_target = self.elems[idx].box.get_center()
+            # index labels stay under their slot, only the label of the new last slot is rendered
+            new_labels = []
+            if self.add_indices:
+                new_labels.append(self.elems[-1]._make_label(self.n-1).shift(step))
+                self._relabel(idx, [new_elem] + self.elems[idx:], [elem.label for elem in self.elems[idx:]] + new_labels)
+            new_elem_shift = new_elem_target - new_elem.box.get_center()
             anims = [
-                Create(new_elem),
+                AnimationGroup(Create(new_elem.box), Create(new_elem.content)),
                 AnimationGroup([
-                    new_elem.animate.move_to(self.elems[idx]),
-                    *[elem.animate.shift(
-                        RIGHT*(elem.width + self.inter_elem_buff)
-                    ) for elem in self.elems[idx:]],
-                    *([Transform(elem.label, Text(
-                        str(int(elem.label.text)+1), **self.label_style).move_to(elem.label).shift(
-                            RIGHT*(elem.width + self.inter_elem_buff)
-                        )
-                    ) for elem in self.elems[idx:]] if self.add_indices else [])
+                    Translate(new_elem.box, new_elem_shift),
+                    Translate(new_elem.content, new_elem_shift),
+                    *[Translate(part, step) for elem in self.elems[idx:] for part in (elem.box, elem.content)],
+                    *[FadeIn(label) for label in new_labels]
                 ])
             ]
-            if self.add_indices:
-                for elem in self.elems[idx:]:
-                    elem.label.text = str(int(elem.label.text)+1)
             self.elems.insert(idx, new_elem)
             self.add(new_elem)
             return Succession(anims)
@@ -141,41 +155,40 @@ class Array(VGroup):
         self.values.pop(idx)
         self.n -= 1
         old_elem = self.elems[idx]
+        step = LEFT*(old_elem.box.width + self.inter_elem_buff)
+        # the label of the last slot is left without element
+        old_labels = []
+        if self.add_indices:
+            old_labels.append(self.elems[-1].label)
+            self._relabel(idx, self.elems[idx+1:], [elem.label for elem in self.elems[idx:]])
         anims = [
-            old_elem.animate.shift(UP*2),
+            Translate(old_elem, UP*2),
             AnimationGroup([
                 Uncreate(old_elem),
-                *[elem.animate.shift(LEFT*(elem.width + self.inter_elem_buff)) for elem in self.elems[idx+1:]],
-                *([Transform(elem.label, Text(
-                    str(int(elem.label.text)-1), **self.label_style).move_to(elem.label).shift(
-                        LEFT*(elem.width + self.inter_elem_buff)
-                    ) 
-                ) for elem in self.elems[idx+1:]] if self.add_indices else []),
+                *[Translate(part, step) for elem in self.elems[idx+1:] for part in (elem.box, elem.content)],
+                *[FadeOut(label) for label in old_labels]
             ])
         ]
-        if self.add_indices:
-            for elem in self.elems[idx+1:]:
-                elem.label.text = str(int(elem.label.text)-1)
         self.elems.remove(old_elem)
         self.remove(old_elem)
         return Succession(anims)
-        
+
+    def _relabel(self, idx: int, elems: list[Element], labels: list[Text]):
+        # reparents the labels of slots idx.. to the elements that will occupy those slots, nothing is rendered
+        for elem in self.elems[idx:]:
+            elem.set_label(None)
+        for elem, label in zip(elems, labels):
+            elem.set_label(label)
+
     def switch(self, i: int, j: int):
         if 0 <= i < self.n and 0 <= j < self.n and i != j:
             self.values[i], self.values[j] = self.values[j], self.values[i]
+            contents = [self.elems[i].content, self.elems[j].content]
+            step = self.elems[j].content.get_center() - self.elems[i].content.get_center()
             anims = [
-                AnimationGroup(
-                    self.elems[i].content.animate.shift(UP*2),
-                    self.elems[j].content.animate.shift(UP*2)
-                ),
-                AnimationGroup(
-                    self.elems[i].content.animate.move_to(self.elems[j].content.get_center() + UP*2),
-                    self.elems[j].content.animate.move_to(self.elems[i].content.get_center() + UP*2)
-                ),
-                AnimationGroup(
-                    self.elems[i].content.animate.move_to(self.elems[j].content),
-                    self.elems[j].content.animate.move_to(self.elems[i].content)
-                ),
+                AnimationGroup(*[Translate(content, UP*2) for content in contents]),
+                AnimationGroup(Translate(contents[0], step), Translate(contents[1], -step)),
+                AnimationGroup(*[Translate(content, DOWN*2) for content in contents])
             ]
             self.elems[i].remove(self.elems[i].content)
             self.elems[i].add(self.elems[j].content)
@@ -185,23 +198,18 @@ class Array(VGroup):
             return Succession(anims)
 
     def _reorder(self, indices: list[int]):
+        # elements move to their new slot while index labels stay in place and are only reparented
         self.values = [self.values[idx] for idx in indices]
-        anims = [
-            AnimationGroup([
-                self.elems[idx].animate.move_to(self.elems[i]) for i, idx in enumerate(indices)
-            ])
+        centers = [elem.box.get_center() for elem in self.elems]
+        labels = [elem.label for elem in self.elems]
+        moves = [
+            Translate(part, center - self.elems[idx].box.get_center())
+            for center, idx in zip(centers, indices) for part in (self.elems[idx].box, self.elems[idx].content)
         ]
         if self.add_indices:
-            anims.append(
-                AnimationGroup([
-                    Transform(self.elems[idx].label, Text(str(i), **self.label_style).move_to(self.elems[i].label)) 
-                    for i, idx in enumerate(indices)
-                ])
-            )
-            for i, idx in enumerate(indices):
-                self.elems[idx].label.text = str(i)
+            self._relabel(0, [self.elems[idx] for idx in indices], labels)
         self.elems = [self.elems[idx] for idx in indices]
-        return Succession(anims)
+        return AnimationGroup(*moves)
 
     def sort(self, func=None, reverse: bool=False):
         if func:
@@ -214,6 +222,95 @@ class Array(VGroup):
         indices = sorted(list(range(len(self.values))), key=lambda _: random.random())
         return self._reorder(indices)
 
+    def update_to(self, new_values: list[any]) -> Animation:
+        # turns the array into new_values with a minimal edit: runs of values kept in order (difflib) keep
+        # their elements, removed values that reappear elsewhere move to their new slot, the remaining
+        # removed and added values of a same changed run recycle elements with replace_value, the rest
+        # fades out or in. Only cells that change slot or value are animated, index labels stay in place
+        assert isinstance(new_values, list) and len(new_values) > 0, "values must be a non-empty list"
+        new_values = list(new_values)
+        matcher = difflib.SequenceMatcher(None, self.values, new_values, autojunk=False)
+        sources = [None]*len(new_values)
+        changed_runs = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == 'equal':
+                sources[j1:j2] = range(i1, i2)
+            else:
+                changed_runs.append((list(range(i1, i2)), list(range(j1, j2))))
+        removed_by_value = defaultdict(deque)
+        for removed, _ in changed_runs:
+            for i in removed:
+                removed_by_value[self.values[i]].append(i)
+        for _, added in changed_runs:
+            for j in added:
+                if removed_by_value[new_values[j]]:
+                    sources[j] = removed_by_value[new_values[j]].popleft()
+        moved = set(i for i in sources if i is not None)
+        recycled = {}
+        for removed, added in changed_runs:
+            removed = [i for i in removed if i not in moved]
+            added = [j for j in added if sources[j] is None]
+            for i, j in zip(removed, added):
+                sources[j] = i
+                recycled[j] = i
+        kept = set(i for i in sources if i is not None)
+        removed = [elem for i, elem in enumerate(self.elems) if i not in kept]
+
+        step = RIGHT*(self.box_style.width + self.inter_elem_buff)
+        origin = self.elems[0].box.get_center()
+        new_elems, new_parts = [], []
+        for j, i in enumerate(sources):
+            if i is None:
+                elem = Element(
+                    new_values[j],
+                    None,
+                    self.box_style,
+                    self.content_style,
+                    self.content_direction,
+                    self.label_style,
+                    self.label_direction,
+                    self.label_buff
+                )
+                elem.shift(origin + j*step - elem.box.get_center())
+                new_parts.extend([elem.box, elem.content])
+            else:
+                elem = self.elems[i]
+            new_elems.append(elem)
+        moving = [
+            (elem, origin + j*step - elem.box.get_center()) for j, (elem, i) in enumerate(zip(new_elems, sources))
+            if i is not None and not np.allclose(elem.box.get_center(), origin + j*step)
+        ]
+
+        old_n, new_n = self.n, len(new_values)
+        added_labels, removed_labels = [], []
+        if self.add_indices:
+            labels = [elem.label for elem in self.elems]
+            added_labels = [self.elems[-1]._make_label(k).shift((k-old_n+1)*step) for k in range(old_n, new_n)]
+            removed_labels = labels[new_n:]
+            self._relabel(0, new_elems, labels[:new_n] + added_labels)
+
+        # values are rewritten in place, then cells move to their slot, then new cells appear
+        rewrites = (
+            [FadeOut(elem) for elem in removed] + [FadeOut(label) for label in removed_labels] +
+            [new_elems[j].replace_value(new_values[j]) for j in recycled]
+        )
+        moves = [Translate(part, shift) for elem, shift in moving for part in (elem.box, elem.content)]
+        appears = [Reveal(part) for part in new_parts] + [Reveal(label) for label in added_labels]
+        self.remove(*removed)
+        self.values, self.n, self.elems = new_values, new_n, new_elems
+        self.add(*[elem for elem in new_elems if elem not in self.submobjects])
+        # new cells and labels are hidden by their Reveal until the last phase
+        anims = [AnimationGroup(*phase) for phase in [rewrites, moves, appears] if phase]
+        return Succession(*anims) if anims else Wait(0.5)
+
+    def highlight(self, indices: slice|range|list[int]|list[bool]=None, **highlight_style) -> Animation:
+        # highlights a range, a list of positions or a mask of elements as a single animation,
+        # highlight_style takes the same arguments as Element.highlight
+        return highlight_elements(select_elements(self.elems, indices), owner=self, **highlight_style)
+
+    def unhighlight(self, indices: slice|range|list[int]|list[bool]=None) -> Animation:
+        return restore_elements(select_elements(self.elems, indices), self)
+
 
 class TestManim(Scene):
     def construct(self):
@@ -234,3 +331,5 @@ class TestManim(Scene):
         self.wait()
         self.play(a.sort())
         self.wait()
+        self.play(a.update_to([1, 8, 12, 20, 35, 7, 50, 88, 99, 3]))
+        self.wait()
@@ -0,0 +1,58 @@
+from manim import *
+from typing import Callable
+import numpy.typing as npt
+from typing_extensions import TypeAlias
+
+
+Vector3D: TypeAlias = npt.NDArray[np.float64]
+
+
+def candidate_directions(num_dirs: int=36) -> np.ndarray:
+    angles = np.linspace(0, TAU, num_dirs)
+    return np.stack([np.cos(angles), np.sin(angles), np.zeros(num_dirs)], axis=1)
+
+
+# cost functions score every candidate from a (num_dirs, num_obstacles) distance matrix,
+# the candidate with the highest score wins
+def sum_of_distances(distances: np.ndarray) -> np.ndarray:
+    return distances.sum(axis=1)
+
+
+def nearest_distance(distances: np.ndarray) -> np.ndarray:
+    return distances.min(axis=1)
+
+
+def _as_points(objs: list[Vector3D|Mobject]) -> np.ndarray:
+    return np.array([o.get_center() if isinstance(o, Mobject) else o for o in objs], dtype=np.float64).reshape(-1, 3)
+
+
+def best_direction(
+        center: Vector3D|Mobject,
+        to_avoid: list[Vector3D|Mobject],
+        num_dirs: int=36,
+        cost: Callable[[np.ndarray], np.ndarray]=sum_of_distances,
+        radius: float=1.0,
+        kdtree_threshold: int=256,
+        chunk_size: int=4096
+) -> Vector3D:
+    # returns the unit direction from center whose point at distance radius is the best placed
+    # with respect to the points to avoid, all candidates are scored in one broadcast computation
+    directions = candidate_directions(num_dirs)
+    center = center.get_center() if isinstance(center, Mobject) else np.asarray(center, dtype=np.float64)
+    obstacles = _as_points(to_avoid)
+    if len(obstacles) == 0:
+        return directions[0]
+    candidates = center + radius*directions
+    if cost is nearest_distance and len(obstacles) > kdtree_threshold:
+        # only the closest obstacle matters, a KD-tree avoids the full distance matrix
+        from scipy.spatial import cKDTree
+        scores, _ = cKDTree(obstacles).query(candidates)
+    elif cost is sum_of_distances and len(obstacles) > chunk_size:
+        # additive cost, obstacles are processed in chunks to bound the size of the distance matrix
+        scores = np.zeros(num_dirs)
+        for start in range(0, len(obstacles), chunk_size):
+            chunk = obstacles[start:start+chunk_size]
+            scores += sum_of_distances(np.linalg.norm(candidates[:, None, :] - chunk[None, :, :], axis=2))
+    else:
+        scores = cost(np.linalg.norm(candidates[:, None, :] - obstacles[None, :, :], axis=2))
+    return directions[np.argmax(scores)]
@@ -0,0 +1,73 @@
+from manim import *
+import numpy.typing as npt
+from typing_extensions import TypeAlias
+
+
+Vector3D: TypeAlias = npt.NDArray[np.float64]
+
+
+class PointCloud(PMobject):
+    # all points in one array with one rgba per point, recolored or faded through boolean masks
+    # so a single animation covers any number of points, point_size is in pixels
+    def __init__(
+            self,
+            points: list[tuple[float,float]]|npt.ArrayLike,
+            color: ParsableManimColor=WHITE,
+            opacity: float=1.0,
+            point_size: float=8,
+            **kwargs
+    ):
+        super().__init__(stroke_width=point_size, **kwargs)
+        coords = np.asarray(points, dtype=np.float64).reshape(len(points), -1)
+        assert coords.shape[1] in (2, 3), "points must be 2D or 3D"
+        if coords.shape[1] == 2:
+            coords = np.hstack([coords, np.zeros((len(coords), 1))])
+        self.add_points(coords, rgbas=np.tile(color_to_rgba(color, opacity), (len(coords), 1)))
+        # position of every input point, for lookups by coordinates
+        self.index = {tuple(p): i for i, p in enumerate(coords[:, :2].tolist())}
+
+    def index_of(self, point: tuple[float,float]) -> int:
+        return self.index[tuple(point[:2])]
+
+    def point(self, point: tuple[float,float]) -> Vector3D:
+        return self.points[self.index_of(point)].copy()
+
+    def mask(self, selection: list[tuple[float,float]]|list[int]|list[bool]=None) -> np.ndarray:
+        # boolean mask over the points from another mask, a list of indices or a list of points
+        if selection is None:
+            return np.ones(len(self.points), dtype=bool)
+        selection = np.asarray(selection)
+        if selection.dtype == bool:
+            assert len(selection) == len(self.points), "a mask must have one entry per point"
+            return selection
+        mask = np.zeros(len(self.points), dtype=bool)
+        if selection.ndim == 2:
+            selection = [self.index_of(p) for p in selection.tolist()]
+        mask[np.asarray(selection, dtype=np.intp)] = True
+        return mask
+
+    def set_colors(self, color: ParsableManimColor, selection=None) -> "PointCloud":
+        self.rgbas[self.mask(selection), :3] = color_to_rgb(color)
+        return self
+
+    def set_opacities(self, opacity: float, selection=None) -> "PointCloud":
+        self.rgbas[self.mask(selection), 3] = opacity
+        return self
+
+    # opacity changes of all points, used by FadeIn/FadeOut
+    def set_opacity(self, opacity: float, family: bool=True) -> "PointCloud":
+        return self.set_opacities(opacity)
+
+    def fade(self, darkness: float=0.5, family: bool=True) -> "PointCloud":
+        self.rgbas[:, 3] *= 1 - darkness
+        return self
+
+
+class TestPointCloud(Scene):
+    def construct(self):
+        rng = np.random.default_rng(0)
+        cloud = PointCloud(rng.normal(size=(20000, 2))*2, point_size=4)
+        self.play(FadeIn(cloud))
+        inside = np.linalg.norm(cloud.points, axis=1) < 2
+        self.play(cloud.animate.set_colors(ORANGE, inside).set_opacities(0.3, ~inside))
+        self.wait()
@@ -1,6 +1,9 @@
 from manim import *
 import numpy.typing as npt
 from typing_extensions import TypeAlias
+from .text_cache import cached_text
+from .placement import best_direction
+from .animations import RotateTo, Translate, next_to_vector
 
 
 Vector3D: TypeAlias = npt.NDArray[np.float64]
@@ -20,20 +23,10 @@ class Pointer(VGroup):
         super().__init__()
         self.shape = pointer_style.copy()
         self.label_buff = label_buff
-        self.label = Text(label if label is not None else '', **label_style).next_to(self.shape, buff=label_buff)
+        self.label = cached_text(label if label is not None else '', **label_style).next_to(self.shape, buff=label_buff)
         self.angle = 0
         self.add([self.shape] + ([self.label] if label is not None else []))
         
-    def _find_best_direction(self, pointed_at: Mobject, to_avoid: list[Vector3D|Mobject], num_dirs: int=36):
-        angles = np.linspace(0, TAU, num_dirs)
-        potential_directions = [np.array([np.cos(a), np.sin(a), 0]) for a in angles]
-        centers_to_avoid = [p if isinstance(p, Vector3D) else p.get_center() for p in to_avoid]
-        # returns the direction with the greatest total sum of distances from points to avoid
-        return max(
-            potential_directions, 
-            key=lambda d: sum([np.linalg.norm(c - (pointed_at.get_center() + d)) for c in centers_to_avoid])
-        )
-
     def point_at(
             self,
             pointed_at: Mobject, 
@@ -42,12 +35,19 @@ class Pointer(VGroup):
             to_avoid: list[Vector3D|Mobject]=None
         ):
         if isinstance(direction, str) and direction == 'auto':
-            direction = self._find_best_direction(pointed_at, to_avoid) if to_avoid != [] else DOWN
+            direction = best_direction(pointed_at, to_avoid) if to_avoid else DOWN
         rotation_degrees = 90 + np.degrees(np.arctan2(direction[1], direction[0]))
-        target_shape = self.shape.copy().next_to(pointed_at, direction, buff).rotate((rotation_degrees-self.angle)*DEGREES)
+        # the shape moves next to pointed_at while turning about its moving center, the label goes next to the
+        # turned shape, whose bounds are computed from its rotated points instead of a target copy
+        shape_shift = next_to_vector(self.shape, pointed_at, direction, buff)
+        center = self.shape.get_center()
+        rotated = (self.shape.points - center) @ rotation_matrix((rotation_degrees-self.angle)*DEGREES, OUT).T
+        low, high = rotated.min(axis=0), rotated.max(axis=0)
+        rotated_edge = np.where(np.asarray(direction) > 0, high, np.where(np.asarray(direction) < 0, low, (low+high)/2))
+        label_target = center + shape_shift + rotated_edge + self.label_buff*direction
         anims = [
-            self.shape.animate.next_to(pointed_at, direction, buff).rotate((rotation_degrees-self.angle)*DEGREES),
-            self.label.animate.next_to(target_shape, direction, self.label_buff)
+            RotateTo(self.shape, rotation_degrees*DEGREES, self.angle*DEGREES, shift=shape_shift),
+            Translate(self.label, next_to_vector(self.label, label_target, direction, 0))
         ]
         self.angle = rotation_degrees
         return AnimationGroup(anims)
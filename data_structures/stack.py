@@ -1,12 +1,22 @@
 from manim import *
+import hashlib
+import os
 import numpy.typing as npt
 from typing_extensions import TypeAlias
-from .element import Element
+from .animations import ScaleAbout, Translate, next_to_vector
+from .element import Element, highlight_elements, restore_elements, select_elements
+from .text_cache import cached_text
 
 
 Vector3D: TypeAlias = npt.NDArray[np.float64]
 
 class StackElement(VGroup):
+    # the cylinder is built with two boolean operations, so its parts are computed once per
+    # (height, width, ellipse_height, colors) and every new StackElement gets copies of them,
+    # set cache_dir to also persist the boolean body across processes
+    _prototypes: dict = {}
+    cache_dir: str = None
+
     def __init__(
             self, 
             height: float=1.3, # total height (ellipse height + body height)
@@ -18,24 +28,41 @@ class StackElement(VGroup):
         ):
         self.body_height = height - ellipse_height
         self.ellipse_height = ellipse_height
+        key = (height, width, ellipse_height, str(stroke_color), str(fill_color), fill_opacity)
+        if key not in StackElement._prototypes:
+            StackElement._prototypes[key] = self._build(key, stroke_color, fill_color)
+        super().__init__(*[part.copy() for part in StackElement._prototypes[key]])
+        self.center()
+
+    @classmethod
+    def _build(cls, key: tuple, stroke_color: ParsableManimColor, fill_color: ParsableManimColor) -> list[VMobject]:
+        height, width, ellipse_height, _, _, fill_opacity = key
+        body_height = height - ellipse_height
         bottom_arc = Arc(radius=width/2, angle=-PI).set_fill(
             color=fill_color, opacity=fill_opacity
         ).set_stroke(stroke_color).stretch_to_fit_height(ellipse_height/2)
         left_edge = Line(
             bottom_arc.get_left() + ellipse_height/5*UP, 
-            bottom_arc.get_left() + (ellipse_height/5+self.body_height)*UP,
+            bottom_arc.get_left() + (ellipse_height/5+body_height)*UP,
             color=stroke_color
         )
         right_edge = left_edge.copy().shift(width*RIGHT)
         top_ellipse = Ellipse(width=width, height=ellipse_height).set_fill(
             fill_color, fill_opacity
         ).set_stroke(stroke_color).move_to(left_edge.get_end() + width/2 * RIGHT)
-        rectangle = Rectangle(height=self.body_height, width=width).next_to(left_edge, buff=0.0)
-        rectangle = Difference(
-            Difference(rectangle, top_ellipse), bottom_arc
-        ).set_fill(fill_color, fill_opacity).set_stroke(None, width=0.0, opacity=0.0)
-        super().__init__(bottom_arc, left_edge, right_edge, rectangle, top_ellipse)
-        self.center()
+        cache_file = None
+        if cls.cache_dir is not None:
+            cache_file = os.path.join(cls.cache_dir, f'stack_body_{hashlib.sha1(repr(key).encode()).hexdigest()}.npy')
+        if cache_file is not None and os.path.exists(cache_file):
+            rectangle = VMobject().set_points(np.load(cache_file))
+        else:
+            rectangle = Rectangle(height=body_height, width=width).next_to(left_edge, buff=0.0)
+            rectangle = Difference(Difference(rectangle, top_ellipse), bottom_arc)
+            if cache_file is not None:
+                os.makedirs(cls.cache_dir, exist_ok=True)
+                np.save(cache_file, rectangle.points)
+        rectangle.set_fill(fill_color, fill_opacity).set_stroke(None, width=0.0, opacity=0.0)
+        return [bottom_arc, left_edge, right_edge, rectangle, top_ellipse]
 
 
 class Stack(VGroup):
@@ -52,88 +79,145 @@ class Stack(VGroup):
             max_height: float=config.frame_height*0.9,
             box_style: VMobject=StackElement(),
             content_style: dict={'font_size': 32},
-            content_direction: Vector3D=ORIGIN
+            content_direction: Vector3D=ORIGIN,
+            capacity: int=None,
+            max_visible: int=None
     ):
         assert isinstance(values, list), "values must be a list"
+        assert max_visible is None or max_visible > 0, "max_visible must be positive"
         
         super().__init__()
         self.values: list = values
         self.n = len(values)
+
+        # layout is computed up front for max(n, capacity) cells so that cells and fonts are built once at
+        # their final size and pushes up to capacity never rescale the stack, the styles are per-instance
+        # copies so the shared defaults are never mutated. With max_visible, only the top max_visible
+        # cells are shown above a "+m more" cell holding the count of the hidden ones
+        self.label = cached_text(stack_label, **stack_label_style)
+        self.max_visible = max_visible
+        if capacity is None and max_visible is not None:
+            capacity = max_visible + 1
+        num_cells = max(self.n, capacity or 0)
+        if max_visible is not None:
+            num_cells = min(num_cells, max_visible + 1)
+        overlap = box_style.ellipse_height if isinstance(box_style, StackElement) else 0.0
+        base_height = box_style.ellipse_height/2 if isinstance(box_style, StackElement) else box_style.height/2
+        cells_height = num_cells*box_style.height + (num_cells-1)*(inter_elem_buff - overlap) if num_cells else 0.0
+        height = max(cells_height, base_height) + (
+            stack_label_buff + self.label.height if stack_label and stack_label_direction[1] < 0 else 0.0
+        )
+        ratio = min(1.0, max_height/height)
+        self.box_style = box_style.copy().scale(ratio)
+        self.content_style = {**content_style, 'font_size': content_style.get('font_size', 32)*ratio}
+        self.content_direction = (content_direction + overlap/2*DOWN)*ratio
+        self.inter_elem_buff = (inter_elem_buff - overlap)*ratio
+        self.stack_bottom = stack_bottom
+        self.stack_label_direction, self.stack_label_buff = stack_label_direction, stack_label_buff*ratio
+        self.add_indices = False
+        self.max_height = max_height
         if isinstance(box_style, StackElement):
-            inter_elem_buff += box_style.ellipse_height*DOWN
-            content_direction = content_direction.copy() + box_style.ellipse_height/2*DOWN
             self.base = Arc(
-                radius=box_style.width/2, angle=-PI, stroke_width=10.0
-            ).stretch_to_fit_height(box_style.ellipse_height/2)
+                radius=self.box_style.width/2, angle=-PI, stroke_width=10.0
+            ).stretch_to_fit_height(overlap*ratio/2)
         else:
             self.base = VMobject(stroke_width=10.0).start_new_path(ORIGIN)
             for point in [
-                box_style.height/2*DOWN, box_style.height/2*DOWN + box_style.width*RIGHT, box_style.width*RIGHT
+                self.box_style.height/2*DOWN,
+                self.box_style.height/2*DOWN + self.box_style.width*RIGHT,
+                self.box_style.width*RIGHT
             ]:
                 self.base.add_line_to(point)
-        self.elems = [
-            Element(
-                v,
-                None,
-                box_style, 
-                content_style,
-                content_direction
-            ) for i, v in enumerate(values)
-        ]
-        VGroup(self.elems).arrange(UP, buff=inter_elem_buff)
-        self.base.next_to(VGroup(self.elems), DOWN, buff=-self.base.height)
-        self.label = Text(
-            str(stack_label), **stack_label_style
-        ).next_to(self.base, stack_label_direction, stack_label_buff)
-        self.stack_bottom = stack_bottom
-        self.stack_label_direction, self.stack_label_buff = stack_label_direction, stack_label_buff
-        self.inter_elem_buff = inter_elem_buff
-        self.add_indices = False
-        self.max_height = max_height
-        self.box_style = box_style
-        self.content_style, self.content_direction = content_style, content_direction
-        self.add(self.elems, [self.label] if stack_label else [], self.base)
-        old_height = self.height
-        self.scale_to_fit_height(min(self.height, max_height))
-        self._update_styles_after_scaling(self.height/old_height)
-        self.next_to(stack_bottom, UP, buff=0.0)
+
+        # the base sits on stack_bottom, or right above the label, and the cells are stacked from the base
+        self.label.scale(ratio)
+        below = stack_label and stack_label_direction[1] < 0
+        bottom = stack_bottom + (UP*(self.label.height + self.stack_label_buff) if below else ORIGIN)
+        self.base.move_to(bottom + UP*self.base.height/2)
+        self.label.next_to(self.base, stack_label_direction, self.stack_label_buff)
+        self.hidden = 0 if max_visible is None else max(0, self.n - max_visible)
+        self.more = self._make_more(self.hidden) if self.hidden else None
+        first_slot = 1 if self.hidden else 0
+        self.elems = [self._make_elem(v, first_slot + k) for k, v in enumerate(values[self.hidden:])]
+        self.add(self.elems, [self.more] if self.more else [], [self.label] if stack_label else [], self.base)
+
+    def _slot_center(self, slot: int) -> Vector3D:
+        # cells are stacked from the bottom of the base, the first one sits in the base
+        step = self.box_style.height + self.inter_elem_buff
+        return self.base.get_bottom() + UP*(self.box_style.height/2 + slot*step)
+
+    def _make_elem(self, value: any, slot: int) -> Element:
+        return Element(
+            value,
+            None,
+            self.box_style,
+            self.content_style,
+            self.content_direction
+        ).move_to(self._slot_center(slot))
+
+    def _make_more(self, count: int) -> Element:
+        return Element(
+            f'+{count} more',
+            None,
+            self.box_style.copy().set_stroke(opacity=0.3),
+            self.content_style,
+            self.content_direction
+        ).move_to(self._slot_center(0))
+
+    def _set_more(self, count: int) -> Animation:
+        self.more.value = f'+{count} more'
+        return Transform(self.more.content, self.more._make_content(self.more.value))
 
     def _update_styles_after_scaling(self, ratio: float):
-        self.box_style.scale(ratio)
-        self.content_style['font_size'] = self.content_style.get('font_size', 32)*ratio
-        self.content_direction *= ratio
-        self.inter_elem_buff *= ratio
+        # the stack outgrew its capacity and was scaled down, new per-instance styles at the new size
+        self.box_style = self.box_style.copy().scale(ratio)
+        self.content_style = {**self.content_style, 'font_size': self.content_style.get('font_size', 32)*ratio}
+        self.content_direction = self.content_direction*ratio
+        self.inter_elem_buff = self.inter_elem_buff*ratio
         
     def push(self, value: any, src_pos: Vector3D=None) -> Succession:
         self.values.append(value)
         self.n += 1
-        new_elem = Element(
-            value, 
-            None, 
-            self.box_style, 
-            self.content_style,
-            self.content_direction
-        ).next_to(
-            self.elems[-1] if self.n > 1 else self.base, 
-            UP,
-            self.inter_elem_buff if self.n > 1 else -self.base.height
-        )
         src_pos = src_pos if src_pos is not None else self.get_corner(UR) + UR
+        if self.max_visible is not None and len(self.elems) == self.max_visible:
+            return self._push_collapsed(value, src_pos)
+        new_elem = self._make_elem(value, len(self.elems))
         self.elems.append(new_elem)
         self.add(new_elem)
         self.base.set_z_index(new_elem.z_index+1)
-        anims = [FadeIn(new_elem, target_position=src_pos)]
+        fade_in = FadeIn(new_elem, target_position=src_pos)
         if self.height > self.max_height:
             old_height = self.height
-            anims= [
-                FadeIn(new_elem, target_position=src_pos),
-                self.animate.scale_to_fit_height(self.max_height).next_to(
-                    self.stack_bottom, UP, buff=0.0
-                )
-            ]
+            # scaled about its bottom, which is then moved onto stack_bottom
+            shrink = AnimationGroup(
+                ScaleAbout(self, self.max_height/old_height, about_edge=DOWN),
+                Translate(self, next_to_vector(self, self.stack_bottom, UP, buff=0.0))
+            )
             self._update_styles_after_scaling(self.max_height/old_height)
-            return Succession(anims)
-        return FadeIn(new_elem, target_position=src_pos)
+            return Succession(fade_in, shrink)
+        return fade_in
+
+    def _push_collapsed(self, value: any, src_pos: Vector3D) -> Animation:
+        # the bottom visible cell joins the "+m more" cell, the other ones move down a slot (except on the
+        # first collapse where the bottom cell was in the slot of the "+m more" cell) and the new value
+        # takes the top slot, the work does not depend on the depth of the stack
+        bottom = self.elems.pop(0)
+        self.remove(bottom)
+        self.hidden += 1
+        if self.more is None:
+            self.more = self._make_more(self.hidden)
+            self.add(self.more)
+            anims = [FadeOut(bottom), FadeIn(self.more)]
+        else:
+            step = self.box_style.height + self.inter_elem_buff
+            anims = [FadeOut(bottom, target_position=self.more), self._set_more(self.hidden)]
+            if self.elems:
+                anims.extend(Translate(elem, DOWN*step) for elem in self.elems)
+        new_elem = self._make_elem(value, self.max_visible)
+        self.elems.append(new_elem)
+        self.add(new_elem)
+        self.base.set_z_index(new_elem.z_index+1)
+        return AnimationGroup(*anims, FadeIn(new_elem, target_position=src_pos))
     
     def pop(self, dest_pos: Vector3D=None) -> Succession:
         if self.n == 0:
@@ -143,8 +227,37 @@ class Stack(VGroup):
         old_elem = self.elems.pop()
         self.remove(old_elem)
         dest_pos = dest_pos if dest_pos is not None else old_elem.get_center() + UR
+        if self.hidden:
+            return AnimationGroup(FadeOut(old_elem, target_position=dest_pos), self._pop_collapsed())
         return FadeOut(old_elem, target_position=dest_pos)
-    
+
+    def _pop_collapsed(self) -> Animation:
+        # the top hidden value comes back out of the "+m more" cell, which turns back into the bottom
+        # cell when it was the last hidden one
+        self.hidden -= 1
+        if self.hidden == 0:
+            first = self._make_elem(self.values[0], 0)
+            anims = [FadeOut(self.more), FadeIn(first)]
+            self.remove(self.more)
+            self.more = None
+        else:
+            step = self.box_style.height + self.inter_elem_buff
+            first = self._make_elem(self.values[self.hidden], 1)
+            anims = [FadeIn(first, target_position=self.more), self._set_more(self.hidden)]
+            if self.elems:
+                anims.extend(Translate(elem, UP*step) for elem in self.elems)
+        self.elems.insert(0, first)
+        self.add(first)
+        return AnimationGroup(*anims)
+
+    def highlight(self, indices: slice|range|list[int]|list[bool]=None, **highlight_style) -> Animation:
+        # highlights a range, a list of positions or a mask of elements as a single animation,
+        # highlight_style takes the same arguments as Element.highlight
+        return highlight_elements(select_elements(self.elems, indices), owner=self, **highlight_style)
+
+    def unhighlight(self, indices: slice|range|list[int]|list[bool]=None) -> Animation:
+        return restore_elements(select_elements(self.elems, indices), self)
+
 
 class TestStack(Scene):
     def construct(self):
@@ -156,4 +269,9 @@ class TestStack(Scene):
         self.play(stack.push(45))
         self.play(stack.push(45))
         self.play(stack.push(45))
+        deep = Stack(list(range(30)), 'deep', stack_bottom=stack.stack_bottom + RIGHT*4, max_visible=5)
+        self.add(deep)
+        self.play(deep.push(30))
+        self.play(deep.pop())
+        self.play(deep.pop())
         
\ No newline at end of file
@@ -0,0 +1,58 @@
+from manim import *
+from collections import OrderedDict
+
+
+class TextCache:
+    # bounded LRU cache of rendered Text mobjects keyed by (string, style),
+    # every lookup hands out a copy so callers are free to move/scale/recolor it
+    def __init__(self, max_size: int=2048):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._texts: OrderedDict = OrderedDict()
+
+    @staticmethod
+    def _freeze(value: any):
+        if isinstance(value, dict):
+            return tuple(sorted((k, TextCache._freeze(v)) for k, v in value.items()))
+        if isinstance(value, (list, tuple, np.ndarray)):
+            return tuple(TextCache._freeze(v) for v in value)
+        try:
+            hash(value)
+            return value
+        except TypeError:
+            return repr(value)
+
+    def get(self, text: str, **style) -> Text:
+        key = (text, self._freeze(style))
+        cached = self._texts.get(key)
+        if cached is None:
+            self.misses += 1
+            cached = Text(text, **style)
+            self._texts[key] = cached
+            if len(self._texts) > self.max_size:
+                self._texts.popitem(last=False)
+        else:
+            self.hits += 1
+            self._texts.move_to_end(key)
+        return cached.copy()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self._texts),
+            'hit_rate': self.hits/total if total else 0.0
+        }
+
+    def clear(self):
+        self._texts.clear()
+        self.hits = self.misses = 0
+
+
+text_cache = TextCache()
+
+
+def cached_text(text: any, **style) -> Text:
+    return text_cache.get(str(text), **style)
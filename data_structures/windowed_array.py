@@ -0,0 +1,232 @@
+from manim import *
+import numpy.typing as npt
+from typing_extensions import TypeAlias
+from .element import Element
+from .text_cache import cached_text
+
+Vector3D: TypeAlias = npt.NDArray[np.float64]
+
+
+class WindowedElements:
+    # list-like view over the cells of a WindowedArray, only cells in view can be indexed: focus moves
+    # the windows and rebinds elements to other indices, so it is never done behind an indexing and
+    # scenes keep indices rather than elements across focus calls
+    def __init__(self, array: "WindowedArray"):
+        self.array = array
+
+    def __len__(self):
+        return self.array.n
+
+    def __iter__(self):
+        return iter(self.array.visible_elems())
+
+    def __getitem__(self, idx: int|slice):
+        n = self.array.n
+        if isinstance(idx, slice):
+            return [self.array.elem_at(i) for i in range(*idx.indices(n)) if self.array.is_visible(i)]
+        if idx >= n or idx < -n:
+            raise IndexError("index out of range")
+        idx %= n
+        assert self.array.is_visible(idx), "cell is not in view, focus it first"
+        return self.array.elem_at(idx)
+
+
+class WindowedArray(VGroup):
+    # Array view for large inputs: only num_segments windows of window_size cells are shown,
+    # hidden ranges are replaced by elision markers, and cells are recycled as the windows move
+    def __init__(
+            self,
+            values: list[any],
+            array_label: str=None,
+            window_size: int=7,
+            num_segments: int=2,
+            array_label_direction: Vector3D=UL,
+            array_label_buff: float=DEFAULT_MOBJECT_TO_MOBJECT_BUFFER,
+            array_label_style: dict={'font_size': 28},
+            array_center: Vector3D=ORIGIN,
+            inter_elem_buff: float=0.0,
+            add_indices: bool=True,
+            max_width: float=config.frame_width*0.9,
+            box_style: VMobject=Square(side_length=1),
+            content_style: dict={'font_size': 32},
+            content_direction: Vector3D=ORIGIN,
+            label_style: dict={'font': 'Consolas', 'font_size': 24, 'color': BLUE},
+            label_direction: Vector3D=DOWN,
+            label_buff: float=DEFAULT_MOBJECT_TO_MOBJECT_BUFFER,
+            marker_style: dict={'font_size': 32, 'color': GREY}
+    ):
+        assert isinstance(values, list) and len(values) > 0, \
+            "values must be a non-empty list"
+        assert window_size > 0 and num_segments > 0, \
+            "window_size and num_segments must be positive"
+
+        super().__init__()
+        self.values: list = values
+        self.n = len(values)
+        # everything fits: a single segment showing all cells and no markers
+        self.windowed = self.n > num_segments*(window_size+1) - 1
+        self.window_size = window_size if self.windowed else self.n
+        self.num_segments = num_segments if self.windowed else 1
+        self.num_slots = self.num_segments*(self.window_size+1) + (1 if self.windowed else -1)
+
+        # layout is computed up front so that lazily created cells are built at their final size
+        ratio = min(1.0, max_width/(self.num_slots*box_style.width + (self.num_slots-1)*inter_elem_buff))
+        self.box_style = box_style.copy().scale(ratio)
+        self.content_style = {**content_style, 'font_size': content_style.get('font_size', 32)*ratio}
+        self.label_style = {**label_style, 'font_size': label_style.get('font_size', 24)*ratio}
+        self.marker_style = {**marker_style, 'font_size': marker_style.get('font_size', 32)*ratio}
+        self.content_direction = content_direction*ratio
+        self.label_direction, self.label_buff = label_direction, label_buff*ratio
+        self.inter_elem_buff = inter_elem_buff*ratio
+        self.add_indices = add_indices
+        self.array_center = array_center
+        step = self.box_style.width + self.inter_elem_buff
+        # slots are placed relative to an invisible box at the array center that moves with the array, so
+        # cells built or recycled after it was arranged or shifted land where the array is now (a box and
+        # not a VectorizedPoint, whose single point is dropped by Create)
+        self.anchor = self.box_style.copy().set_opacity(0).move_to(array_center)
+        self.slot_offsets = [RIGHT*(s - (self.num_slots-1)/2)*step for s in range(self.num_slots)]
+        self.add(self.anchor)
+
+        self.elems = WindowedElements(self)
+        self.starts = [
+            round(k*(self.n - self.window_size)/max(self.num_segments-1, 1)) for k in range(self.num_segments)
+        ]
+        self._slot_elems: dict[int, Element] = {}
+        self._slot_index: dict[int, int] = {}
+        self._markers: dict[int, Element] = {}
+        self.label = cached_text(
+            array_label, **{**array_label_style, 'font_size': array_label_style.get('font_size', 28)*ratio}
+        )
+        self.array_label_direction, self.array_label_buff = array_label_direction, array_label_buff*ratio
+        self._relayout()
+        self.label.next_to(self.slot_box(0), array_label_direction, self.array_label_buff)
+        if array_label:
+            self.add(self.label)
+
+    def slot_center(self, slot: int) -> Vector3D:
+        return self.anchor.get_center() + self.slot_offsets[slot]
+
+    def slot_box(self, slot: int) -> VMobject:
+        return self.box_style.copy().move_to(self.slot_center(slot))
+
+    def _index_to_slot(self) -> dict[int, int]:
+        mapping = {}
+        slot = 1 if self.windowed else 0
+        for k, start in enumerate(self.starts):
+            for i in range(start, start + self.window_size):
+                mapping[i] = slot
+                slot += 1
+            if k < self.num_segments-1:
+                # segments separated by a single hidden cell show it instead of a marker
+                if self.starts[k+1] == start + self.window_size + 1:
+                    mapping[start + self.window_size] = slot
+                slot += 1
+        return mapping
+
+    def _hidden_ranges(self) -> dict[int, tuple[int, int]]:
+        if not self.windowed:
+            return {}
+        W = self.window_size
+        ranges = {0: (0, self.starts[0])}
+        for k in range(self.num_segments-1):
+            ranges[(k+1)*(W+1)] = (self.starts[k] + W, self.starts[k+1])
+        ranges[self.num_slots-1] = (self.starts[-1] + W, self.n)
+        return ranges
+
+    def _place(self, elem: Element, slot: int) -> Element:
+        return elem.shift(self.slot_center(slot) - elem.box.get_center())
+
+    def _make_elem(self, value: any, label: any) -> Element:
+        return Element(
+            value,
+            label,
+            self.box_style,
+            self.content_style,
+            self.content_direction,
+            self.label_style,
+            self.label_direction,
+            self.label_buff
+        )
+
+    def _relayout(self):
+        mapping = self._index_to_slot()
+        for i, slot in mapping.items():
+            elem = self._slot_elems.get(slot)
+            if elem is None:
+                elem = self._place(self._make_elem(self.values[i], i if self.add_indices else None), slot)
+                self._slot_elems[slot] = elem
+            elif self._slot_index.get(slot) != i:
+                self._place(elem.rebind(self.values[i], i if self.add_indices else None), slot)
+            self._slot_index[slot] = i
+            if elem not in self.submobjects:
+                self.add(elem)
+        for slot, (lo, hi) in self._hidden_ranges().items():
+            marker = self._markers.get(slot)
+            if hi - lo > 1 or (hi - lo == 1 and slot in (0, self.num_slots-1)):
+                if slot in self._slot_index:
+                    self.remove(self._slot_elems[slot])
+                    del self._slot_index[slot]
+                if marker is None:
+                    marker = Element('…', f'+{hi-lo}', self.box_style.copy().set_stroke(opacity=0.3),
+                                     self.marker_style, label_style=self.label_style)
+                    self._markers[slot] = marker
+                else:
+                    marker.rebind('…', f'+{hi-lo}')
+                self._place(marker, slot)
+                if marker not in self.submobjects:
+                    self.add(marker)
+            elif marker is not None and marker in self.submobjects:
+                self.remove(marker)
+
+    def _segment_of(self, start: int, stop: int) -> int:
+        W = self.window_size
+        def distance(k):
+            s = self.starts[k]
+            return max(s - (stop-1), start - (s + W - 1), 0)
+        return min(range(self.num_segments), key=distance)
+
+    def is_visible(self, idx: int) -> bool:
+        return idx in self._index_to_slot()
+
+    def focus(self, start: int, stop: int):
+        # brings cells [start, stop) into view by moving the nearest segment
+        mapping = self._index_to_slot()
+        if all(i in mapping for i in range(start, stop)):
+            return
+        W, margin = self.window_size, self.window_size//4
+        k = self._segment_of(start, stop)
+        if start >= self.starts[k]:
+            new_start = max(start - margin, stop - W)
+        else:
+            new_start = min(stop - W + margin, start)
+        lo = 0 if k == 0 else self.starts[k-1] + W + 1
+        hi = self.n - W if k == self.num_segments-1 else self.starts[k+1] - W - 1
+        self.starts[k] = min(max(new_start, lo), hi)
+        self._relayout()
+
+    def focus_on(self, *indices: int):
+        # brings a few cells into view, in a single segment when they fit in one
+        indices = [idx % self.n for idx in indices]
+        if max(indices) - min(indices) < self.window_size:
+            self.focus(min(indices), max(indices)+1)
+        else:
+            for idx in indices:
+                self.focus(idx, idx+1)
+
+    def elem_at(self, idx: int) -> Element:
+        return self._slot_elems[self._index_to_slot()[idx]]
+
+    def visible_elems(self) -> list[Element]:
+        return [self._slot_elems[slot] for _, slot in sorted(self._index_to_slot().items())]
+
+
+class TestWindowedArray(Scene):
+    def construct(self):
+        a = WindowedArray(list(range(10000)), 'array')
+        self.play(Create(a))
+        self.wait()
+        for i in [3, 10, 20, 9990, 9980, 5000]:
+            a.focus_on(i)
+            self.play(a.elems[i].highlight())
+        self.wait()
@@ -1,42 +1,56 @@
 from manim import *
 import numpy as np
-import math
+import numpy.typing as npt
 import random
+from typing_extensions import TypeAlias
+from data_structures.placement import best_direction
+from data_structures.point_cloud import PointCloud
+from step_trace import StepScene, record
+from algorithms.graham_scan import (
+    CLOCKWISE, COLLINEAR, COUNTERCLOCKWISE, dist, graham_scan, graham_scan_indices, orientation, polar_angle
+)
+
+
+Vector3D: TypeAlias = npt.NDArray[np.float64]
+
+
+def grid_step(extent: float, max_lines: int=20) -> float:
+    # smallest step of the form 1, 2 or 5 times a power of ten that keeps at most max_lines lines over extent
+    raw = extent/max_lines
+    magnitude = 10**np.floor(np.log10(raw))
+    return next(m*magnitude for m in (1, 2, 5, 10) if m*magnitude >= raw)
+
+
+def dashed_rays(
+        origin: Vector3D, targets: list[Vector3D], dash_length: float=0.15, dashed_ratio: float=0.5, **style
+) -> VMobject:
+    # all rays from origin as a single VMobject holding one straight subpath per dash, instead of
+    # one DashedLine (and its dash submobjects) per ray, the dashes are ordered by distance to origin
+    # so Create grows all rays together
+    origin = np.asarray(origin, dtype=np.float64)
+    vectors = np.asarray(targets, dtype=np.float64).reshape(-1, 3) - origin
+    lengths = np.linalg.norm(vectors, axis=1)
+    vectors, lengths = vectors[lengths > 0], lengths[lengths > 0]
+    period = dash_length/dashed_ratio
+    counts = np.ceil(lengths/period).astype(int)
+    ray = np.repeat(np.arange(len(lengths)), counts)
+    start = (np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts))*period
+    order = np.argsort(start, kind='stable')
+    ray, start = ray[order], start[order]
+    end = np.minimum(start + dash_length, lengths[ray])
+    a = origin + vectors[ray]*(start/lengths[ray])[:, None]
+    b = origin + vectors[ray]*(end/lengths[ray])[:, None]
+    rays = VMobject(**style)
+    # each dash is a straight cubic bezier a, a+(b-a)/3, a+2(b-a)/3, b
+    rays.set_points(np.stack([a, (2*a+b)/3, (a+2*b)/3, b], axis=1).reshape(-1, 3))
+    return rays
+
+
+class Algorithm(StepScene, MovingCameraScene):
+    iteration_step = 'consider'
+    detailed_iterations = 5
+    interesting_steps = {'pop', 'close'}
 
-
-COUNTERCLOCKWISE = 1
-COLLINEAR = 0
-CLOCKWISE = -1
-
-
-class Algorithm(MovingCameraScene):
-
-    def orientation(self, p1: tuple[float,float], p2: tuple[float,float], p3: tuple[float,float]):
-        x1, y1, x2, y2, x3, y3 = *p1, *p2, *p3
-        diff = (y3-y2)*(x2-x1) - (y2-y1)*(x3-x2)
-        return COUNTERCLOCKWISE if diff > 0 else (CLOCKWISE if diff < 0 else COLLINEAR)
-
-    def dist(self, p1: tuple[float,float], p2: tuple[float,float]):
-        x1, y1, x2, y2 = *p1, *p2
-        return math.sqrt((y2-y1)**2 + (x2-x1)**2)
-    
-    def polar_angle(self, p1: tuple[float,float], p2: tuple[float,float]):
-        dy = p1[1] - p2[1]
-        dx = p1[0] - p2[0]
-        return math.atan2(dy, dx)
-    
-    # finds the best direction to avoid drawing on top of lines from reference point to other points
-    # by generating num_dirs directions then finding the farthest one from other points
-    def find_best_direction(self, reference_point: VMobject, other_points: list[VMobject], num_dirs=36):
-        angles = np.linspace(0, 2*np.pi, num_dirs)
-        potential_directions = [np.array([np.cos(a), np.sin(a), 0]) for a in angles]
-        center = reference_point.get_center()
-        other_centers = [p.get_center() for p in other_points]
-        return max(
-            potential_directions, 
-            key=lambda d: sum([np.linalg.norm(oc - (center + d)) for oc in other_centers])
-        )
-        
     def graham_scan(self, points: list[tuple[float,float]]):
 
         assert isinstance(points, list) and len(points) > 2, "points must be a list of size > 2"
@@ -47,53 +61,41 @@ class Algorithm(MovingCameraScene):
             and isinstance(p[1], (int, float))
             for p in points
         ]), "a point must be a tuple of 2 numbers"
+        _, steps = record(graham_scan, list(points))
 
         min_x, max_x = min([p[0] for p in points]), max([p[0] for p in points])
         min_y, max_y = min([p[1] for p in points]), max([p[1] for p in points])
 
-        # drawing the number plane
+        scene_aspect_ratio = config.frame_width / config.frame_height
+        frame_width = max((max_x-min_x+1)*1.2, (max_y-min_y+1)*1.2*scene_aspect_ratio)
+        frame_center = ((min_x+max_x)/2, (min_y+max_y)/2, 0)
+
+        # drawing the number plane, only over the area the camera will show and with a step growing
+        # with the zoom level, so the number of grid lines doesn't depend on the data extent
+        step = grid_step(frame_width)
+        x_range, y_range = [
+            (np.floor((c - extent/2)/step)*step, np.ceil((c + extent/2)/step)*step, step)
+            for c, extent in zip(frame_center, (frame_width, frame_width/scene_aspect_ratio))
+        ]
         number_plane = NumberPlane(
-            x_range=(-100, 100),
-            y_range=(-100, 100),
+            x_range=x_range,
+            y_range=y_range,
             background_line_style={"stroke_color": WHITE, "stroke_opacity": 0.2}
         )
+        number_plane.shift(-number_plane.c2p(0, 0))
         number_plane.x_axis.set_opacity(0.2)
         number_plane.y_axis.set_opacity(0.2)
         self.play(FadeIn(number_plane), run_time=0.5)
         
-        # VDict that maps each point to its Dot object on the scene
-        points_mobs = VDict({
-            p: Dot((*p, 0), radius=0.1, color=WHITE, fill_opacity=1.0, z_index=float('inf')) for p in points
-        })
+        # all the points in a single mobject, sized like dots of radius 0.1 once the camera is in place
+        cloud = PointCloud(points, color=WHITE, point_size=0.2/frame_width*config.pixel_width, z_index=float('inf'))
+        pos = cloud.point
 
         # draw points and center the camera on the appropriate area
-        scene_aspect_ratio = config.frame_width / config.frame_height
-        self.play(
-            self.camera.frame.animate.set(
-                width=max((max_x-min_x+1)*1.2, (max_y-min_y+1)*1.2*scene_aspect_ratio)
-            ).move_to(
-                ((min_x+max_x)/2, (min_y+max_y)/2, 0)
-        ), FadeIn(points_mobs))
-
-        # finding lowest point p0
-        p0_idx = min(range(len(points)), key=lambda i: (points[i][1], points[i][0]))
-        p0 = points[p0_idx]
-        p0_label = MathTex("p_0", font_size=32).next_to(points_mobs[p0], DOWN, buff=0.2)
-        horizontal_line = Line((min_x-1, p0[1], 0), (max_x+1, p0[1], 0))
-        dashed_lines = [DashedLine((*p0, 0), (*p, 0), color="#00EFD1", dash_length=0.15, stroke_width=1.0, z_index=float('-inf')) for p in points if p0 != p]
         self.play(
-            Create(horizontal_line),
-            points_mobs[p0].animate.set_color("#00EFD1"),
-            Write(p0_label),
-            run_time=0.5
+            self.camera.frame.animate.set(width=frame_width).move_to(frame_center),
+            FadeIn(cloud)
         )
-        self.play(*[Create(l) for l in dashed_lines], run_time=0.5)
-
-        # sort points according to their polar angle with p0, or distance if equal angles
-        points.sort(key=lambda p: (self.polar_angle(p, p0), self.dist(p, p0)))
-        angle = Sector(1.5, angle=self.polar_angle(points[1], p0), fill_opacity=0.6, stroke_color=PURPLE, stroke_width=1.5, color=BLACK)
-        angle.shift(points_mobs[p0].get_center() - angle.get_arc_center())
-        self.play(FadeIn(angle))
 
         orientation_icons = {
             COUNTERCLOCKWISE: Arc(radius=0.5, angle=2/3*TAU, start_angle=1/4*PI, stroke_width=4).add_tip().scale(0.3),
@@ -105,46 +107,75 @@ class Algorithm(MovingCameraScene):
             COLLINEAR: Text("collinear", fill_opacity=0.8, font_size=20),
             CLOCKWISE: Text("clockwise", fill_opacity=0.8, font_size=20)
         }
-        
+
+        p0, angle, line, rays = None, None, None, None
+        orientation_icon, orientation_label = None, None
         hull_lines = []
-        hull = [p0]
-        for i in range(1, len(points)):
-            new_angle = Sector(1.5, angle=self.polar_angle(points[i], p0), fill_opacity=0.6, stroke_color=PURPLE, stroke_width=1.5, color=BLACK)
-            new_angle.shift(points_mobs[p0].get_center() - new_angle.get_arc_center())
-            line = Line(points_mobs[hull[-1]].get_center(), points_mobs[points[i]].get_center(), color=BLUE if len(hull) >= 2 else ORANGE)
+        hull = []
+
+        def show_orientation(point, turn):
+            nonlocal orientation_icon, orientation_label
+            direction = best_direction(pos(hull[-1]), [pos(hull[-2]), pos(point)])
+            orientation_icon = orientation_icons[turn]
+            orientation_label = orientation_labels[turn]
+            orientation_icon.next_to(pos(hull[-1]), direction, DEFAULT_MOBJECT_TO_MOBJECT_BUFFER+0.1)
+            orientation_label.next_to(orientation_icon, direction)
+            return [Create(orientation_icon), FadeIn(orientation_label)]
+
+        def on_pivot(pivot):
+            nonlocal p0, rays
+            p0 = pivot
+            hull.append(p0)
+            p0_label = MathTex("p_0", font_size=32).next_to(pos(p0), DOWN, buff=0.3)
+            horizontal_line = Line((min_x-1, p0[1], 0), (max_x+1, p0[1], 0))
+            rays = dashed_rays(
+                (*p0, 0), [(*p, 0) for p in points if p0 != p],
+                color="#00EFD1", dash_length=0.15, stroke_width=1.0, z_index=float('-inf')
+            )
+            self.play(
+                Create(horizontal_line),
+                cloud.animate.set_colors("#00EFD1", [p0]),
+                Write(p0_label),
+                run_time=0.5
+            )
+            self.play(Create(rays), run_time=0.5)
+
+        def on_sort(sorted_points):
+            nonlocal angle
+            # points sorted according to their polar angle with p0, or distance if equal angles
+            angle = Sector(1.5, angle=polar_angle(sorted_points[1], p0), fill_opacity=0.6, stroke_color=PURPLE, stroke_width=1.5, color=BLACK)
+            angle.shift(pos(p0) - angle.get_arc_center())
+            self.play(FadeIn(angle))
+
+        def on_consider(point, turn):
+            nonlocal angle, line
+            new_angle = Sector(1.5, angle=polar_angle(point, p0), fill_opacity=0.6, stroke_color=PURPLE, stroke_width=1.5, color=BLACK)
+            new_angle.shift(pos(p0) - new_angle.get_arc_center())
+            line = Line(pos(hull[-1]), pos(point), color=BLUE if len(hull) >= 2 else ORANGE)
             animations = [
                 ReplacementTransform(angle, new_angle),
                 Create(line)
             ]
-            if len(hull) >= 2:
-                best_direction = self.find_best_direction(points_mobs[hull[-1]], [points_mobs[hull[-2]], points_mobs[points[i]]])
-                orientation_icon = orientation_icons[self.orientation(hull[-2], hull[-1], points[i])]
-                orientation_label = orientation_labels[self.orientation(hull[-2], hull[-1], points[i])]
-                orientation_icon.next_to(points_mobs[hull[-1]], best_direction)
-                orientation_label.next_to(orientation_icon, best_direction)
-                animations.extend([Create(orientation_icon), FadeIn(orientation_label)])
+            if turn is not None:
+                animations.extend(show_orientation(point, turn))
             self.play(animations, run_time=0.5)
             angle = new_angle
-            while len(hull) >= 2 and \
-            self.orientation(hull[-2], hull[-1], points[i]) != COUNTERCLOCKWISE:
-                self.wait(0.5)
-                hull.pop()
-                self.play(
-                    Uncreate(hull_lines[-1]),
-                    line.animate.put_start_and_end_on(points_mobs[hull[-1]].get_center(), points_mobs[points[i]].get_center()),
-                    FadeOut(orientation_icon),
-                    FadeOut(orientation_label),
-                    run_time=0.5
-                )
-                hull_lines.pop()
-                if len(hull) >= 2:
-                    best_direction = self.find_best_direction(points_mobs[hull[-1]], [points_mobs[hull[-2]], points_mobs[points[i]]])
-                    orientation_icon = orientation_icons[self.orientation(hull[-2], hull[-1], points[i])]
-                    orientation_label = orientation_labels[self.orientation(hull[-2], hull[-1], points[i])]
-                    orientation_icon.next_to(points_mobs[hull[-1]], best_direction)
-                    orientation_label.next_to(orientation_icon, best_direction)
-                    self.play(Create(orientation_icon), FadeIn(orientation_label), run_time=0.5)
-  
+
+        def on_pop(point, popped, turn):
+            self.wait(0.5)
+            hull.pop()
+            self.play(
+                Uncreate(hull_lines[-1]),
+                line.animate.put_start_and_end_on(pos(hull[-1]), pos(point)),
+                FadeOut(orientation_icon),
+                FadeOut(orientation_label),
+                run_time=0.5
+            )
+            hull_lines.pop()
+            if turn is not None:
+                self.play(*show_orientation(point, turn), run_time=0.5)
+
+        def on_push(point):
             self.wait(0.5)
             if len(hull) >= 2:
                 self.play(
@@ -153,23 +184,30 @@ class Algorithm(MovingCameraScene):
                     FadeOut(orientation_label),
                     run_time=0.5
                 )
-            hull.append(points[i])
+            hull.append(point)
             hull_lines.append(line)
             self.wait(0.5)
-            
-        line = Line(points_mobs[hull[-1]].get_center(), points_mobs[p0].get_center(), color=ORANGE)
-        hull_lines.append(line)
-        self.play(Create(line), run_time=0.5)
-        convex_hull_text = Text("Convex Hull", font_size=48, color=ORANGE, weight=BOLD).next_to(points_mobs[p0], DOWN, buff=0.2)
-        anims = [Write(convex_hull_text), Uncreate(angle)]
-        for p in points:
-            anims.append(
-                points_mobs[p].animate.set_color(ORANGE) if p in hull
-                else points_mobs[p].animate.set_opacity(0.3)
-            )
-        anims.extend([FadeOut(l) for l in dashed_lines])
-        self.play(anims, run_time=0.5)
-        self.wait(3)
+
+        def on_close(final_hull):
+            line = Line(pos(hull[-1]), pos(p0), color=ORANGE)
+            hull_lines.append(line)
+            self.play(Create(line), run_time=0.5)
+            convex_hull_text = Text("Convex Hull", font_size=48, color=ORANGE, weight=BOLD).next_to(pos(p0), DOWN, buff=0.3)
+            anims = [Write(convex_hull_text), Uncreate(angle)]
+            on_hull = cloud.mask(final_hull)
+            anims.append(cloud.animate.set_colors(ORANGE, on_hull).set_opacities(0.3, ~on_hull))
+            anims.append(FadeOut(rays))
+            self.play(anims, run_time=0.5)
+            self.wait(3)
+
+        self.replay(steps, {
+            'pivot': on_pivot,
+            'sort': on_sort,
+            'consider': on_consider,
+            'pop': on_pop,
+            'push': on_push,
+            'close': on_close
+        })
         
     def construct(self):
         points = [
@@ -179,55 +217,3 @@ class Algorithm(MovingCameraScene):
             (3.38, -0.911), (5.94, -2.18), (2.11, -0.911), (4.66, -2.2), (3.38, -2.18), (7.21, -2.782)
         ]
         self.graham_scan(points)
-
-
-def orientation(p1: tuple[float,float], p2: tuple[float,float], p3: tuple[float,float]):
-    x1, y1, x2, y2, x3, y3 = *p1, *p2, *p3
-    diff = (y3-y2)*(x2-x1) - (y2-y1)*(x3-x2)
-    return COUNTERCLOCKWISE if diff > 0 else (CLOCKWISE if diff < 0 else COLLINEAR)
-
-
-def dist(p1: tuple[float,float], p2: tuple[float,float]):
-    x1, y1, x2, y2 = *p1, *p2
-    return math.sqrt((y2-y1)**2 + (x2-x1)**2)
-
-
-def polar_angle(p1: tuple[float,float], p2: tuple[float,float]):
-    dy = p1[1] - p2[1]
-    dx = p1[0] - p2[0]
-    return math.atan2(dy, dx)
-
-    
-def graham_scan(points: list[tuple[float,float]]):
-
-    assert isinstance(points, list) and len(points) > 2, "points must be a list of size > 2"
-    assert all([
-        isinstance(p, tuple) 
-        and len(p) == 2 
-        and isinstance(p[0], (int, float))
-        and isinstance(p[1], (int, float))
-        for p in points
-    ]), "a point must be a tuple of 2 numbers"
-
-    p0 = min(points, key=lambda p: (p[1], p[0]))
-    points.sort(key=lambda p: (polar_angle(p, p0), dist(p, p0)))
-
-    hull = [p0]
-    for i in range(1, len(points)):
-        while len(hull) >= 2 and \
-        orientation(hull[-2], hull[-1], points[i]) != COUNTERCLOCKWISE:
-            hull.pop()
-        hull.append(points[i])
-
-    return hull
-
-
-if __name__ == '__main__':
-    points = [
-        (5.29, 3.48), (9.75, -1.54), (11.02, -0.28), (10.39, -0.28), (11.02, 0.98), 
-        (8.48, -0.911), (9.75, 1), (9.72, 1.6), (9.12, 2.91), (7.85, 2.29), (7.21, 1.62), 
-        (6.57, 0.36), (4.65, 2.29), (5.29, 0.36), (3.38, 2.91), (4.03, 1), (2.75, 1), (5.29, -1.573), 
-        (3.38, -0.911), (5.94, -2.18), (2.11, -0.911), (4.66, -2.2), (3.38, -2.18), (7.21, -2.782)
-    ]
-    print(graham_scan(points))
-    
\ No newline at end of file
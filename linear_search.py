@@ -1,40 +1,61 @@
 from manim import *
 from data_structures.element import Element
 from data_structures.pointer import Pointer
-from data_structures.oned_array import Array
+from data_structures.windowed_array import WindowedArray
+from step_trace import StepScene, record
+from algorithms.linear_search import linear_search
 
 
-class Algorithm(Scene):
+class Algorithm(StepScene, Scene):
+    iteration_step = 'move_pointer'
+    detailed_iterations = 5
+    interesting_steps = {'found', 'not_found'}
+
     def linear_search(self, values: list[any], target: any, anim_speed: float=1.0):
-        arr = Array(values, 'arr')
+        _, steps = record(linear_search, values, target)
+        arr = WindowedArray(values, 'arr', window_size=16, num_segments=1)
         ptr = Pointer(Pointer.triangle, 'i')
         target_elem = Element(target, 'target', label_direction=UP)
         VGroup(arr, target_elem).arrange(UP, buff=1.5).shift(0.5*UP)
         target_elem.shift(LEFT*3)
         self.play(Create(arr), Create(target_elem))
 
-        for i in range(len(values)):
-            ptr.point_at(self, arr.elems[i])
-            if values[i] == target:
-                found_text = Text(f'Found at index {i}', weight=BOLD, color=GREEN, font_size=50).next_to(target_elem.box, buff=0.5)
-                self.play(
-                    target_elem.highlight(GREEN, GREEN, BLACK, GREEN, fill_opacity=1.0, restore=False),
-                    arr.elems[i].highlight(GREEN, GREEN, BLACK, GREEN, fill_opacity=1.0, restore=False),
-                    run_time=0.5/anim_speed
-                )
-                self.play(Write(found_text), run_time=1/anim_speed)
-                self.wait(4/anim_speed)
-                return
+        def on_move_pointer(i):
+            arr.focus_on(i)
+            self.play(ptr.point_at(arr.elems[i]), run_time=0.5/anim_speed)
+
+        def on_mismatch(i):
+            arr.focus_on(i)
             self.play(
                 target_elem.highlight(RED, WHITE, BLACK, RED, scale_ratio=1.0),
                 arr.elems[i].highlight(RED, WHITE, BLACK, RED, scale_ratio=1.0),
                 run_time=0.5/anim_speed
             )
             self.wait(0.2/anim_speed)
-        not_found_text = Text('Not found', weight=BOLD, color=RED, font_size=50).next_to(target_elem.box, buff=0.5)
-        target_elem.highlight(self, RED, RED, BLACK, RED, restore=False, run_time=0.5/anim_speed)
-        self.play(Write(not_found_text), run_time=1/anim_speed)
-        self.wait(4/anim_speed)
+
+        def on_found(i):
+            found_text = Text(f'Found at index {i}', weight=BOLD, color=GREEN, font_size=50).next_to(target_elem.box, buff=0.5)
+            arr.focus_on(i)
+            self.play(
+                target_elem.highlight(GREEN, GREEN, BLACK, GREEN, fill_opacity=1.0, restore=False),
+                arr.elems[i].highlight(GREEN, GREEN, BLACK, GREEN, fill_opacity=1.0, restore=False),
+                run_time=0.5/anim_speed
+            )
+            self.play(Write(found_text), run_time=1/anim_speed)
+            self.wait(4/anim_speed)
+
+        def on_not_found():
+            not_found_text = Text('Not found', weight=BOLD, color=RED, font_size=50).next_to(target_elem.box, buff=0.5)
+            self.play(target_elem.highlight(RED, RED, BLACK, RED, restore=False), run_time=0.5/anim_speed)
+            self.play(Write(not_found_text), run_time=1/anim_speed)
+            self.wait(4/anim_speed)
+
+        self.replay(steps, {
+            'move_pointer': on_move_pointer,
+            'mismatch': on_mismatch,
+            'found': on_found,
+            'not_found': on_not_found
+        })
 
     def construct(self):
         values = [4, 1, 8, 6, 3, 0, 4, 9, -5, 3, 7, 10, 7, 5]
@@ -42,16 +63,3 @@ class Algorithm(Scene):
 
         anim_speed = 1.0
         self.linear_search(values, target, anim_speed)
-
-
-def linear_search(values: list[any], target: any):
-    for i in range(len(values)):
-        if values[i] == target:
-            return i
-    return -1
-
-
-if __name__ == '__main__':
-    values = [4, 1, 8, 6, 3, 0, 4, 9, -5, 3, 7, 10, 7, 5]
-    target = 7
-    print(linear_search(values, target))
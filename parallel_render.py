@@ -0,0 +1,108 @@
+import argparse
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from step_trace import split_steps
+
+# renders a StepScene in independent segments across a process pool then stitches the partial movies:
+#   python parallel_render.py graham_scan.py Algorithm --workers 32 --quality low_quality
+# every segment replays the trace from the start without rendering (see StepScene.start_step)
+# to rebuild the scene state, then renders its own range of loop iterations
+
+
+def _load_scene_class(module_path: str, scene_name: str):
+    module_dir = os.path.dirname(os.path.abspath(module_path))
+    if module_dir not in sys.path:
+        sys.path.insert(0, module_dir)
+    name = os.path.splitext(os.path.basename(module_path))[0]
+    spec = importlib.util.spec_from_file_location(name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return getattr(module, scene_name)
+
+
+def _segment_class(scene_class, start_step: int, stop_step: int|None):
+    return type(scene_class.__name__, (scene_class,), {'start_step': start_step, 'stop_step': stop_step})
+
+
+def probe_steps(module_path: str, scene_name: str) -> tuple[list, str|None]:
+    # builds the scene without rendering anything and stops before the first step, only to read its trace
+    from manim import tempconfig
+    scene_class = _load_scene_class(module_path, scene_name)
+    with tempconfig({'dry_run': True}):
+        scene = _segment_class(scene_class, 1, 0)()
+        scene.render()
+    return scene.steps, scene_class.iteration_step
+
+
+def render_segment(
+        module_path: str, scene_name: str, start_step: int, stop_step: int|None, index: int, out_dir: str, quality: str
+) -> str:
+    from manim import tempconfig
+    scene_class = _load_scene_class(module_path, scene_name)
+    with tempconfig({
+        'quality': quality,
+        'media_dir': os.path.join(out_dir, f'segment_{index}'),
+        'output_file': f'segment_{index}',
+        'disable_caching': True,
+        'verbosity': 'WARNING'
+    }):
+        scene = _segment_class(scene_class, start_step, stop_step)()
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path)
+
+
+def stitch(movie_files: list[str], output: str):
+    list_file = output + '.segments.txt'
+    with open(list_file, 'w') as f:
+        f.writelines(f"file '{os.path.abspath(movie)}'\n" for movie in movie_files)
+    subprocess.run(
+        ['ffmpeg', '-y', '-loglevel', 'error', '-f', 'concat', '-safe', '0', '-i', list_file, '-c', 'copy', output],
+        check=True
+    )
+    os.remove(list_file)
+
+
+def parallel_render(
+        module_path: str,
+        scene_name: str,
+        output: str,
+        workers: int=None,
+        num_segments: int=None,
+        quality: str='low_quality',
+        work_dir: str='media/parallel',
+        keep_segments: bool=False
+) -> str:
+    workers = workers or os.cpu_count()
+    steps, iteration_step = probe_steps(module_path, scene_name)
+    segments = split_steps(steps, num_segments or workers, iteration_step)
+    out_dir = os.path.join(work_dir, f'{os.path.splitext(os.path.basename(module_path))[0]}_{scene_name}')
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(render_segment, module_path, scene_name, start, stop, i, out_dir, quality)
+            for i, (start, stop) in enumerate(segments)
+        ]
+        movie_files = [future.result() for future in futures]
+    stitch(movie_files, output)
+    if not keep_segments:
+        shutil.rmtree(out_dir, ignore_errors=True)
+    return output
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='render a StepScene in parallel segments')
+    parser.add_argument('module', help='path of the scene file, e.g. graham_scan.py')
+    parser.add_argument('scene', nargs='?', default='Algorithm', help='scene class name')
+    parser.add_argument('-o', '--output', default=None, help='stitched movie path')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='worker processes, defaults to cpu count')
+    parser.add_argument('-s', '--segments', type=int, default=None, help='number of segments, defaults to workers')
+    parser.add_argument('-q', '--quality', default='low_quality', help='manim quality name, e.g. high_quality')
+    parser.add_argument('--keep-segments', action='store_true', help="don't delete the partial movies")
+    args = parser.parse_args()
+    output = args.output or f'{os.path.splitext(os.path.basename(args.module))[0]}_{args.scene}.mp4'
+    print(parallel_render(
+        args.module, args.scene, output, args.workers, args.segments, args.quality, keep_segments=args.keep_segments
+    ))
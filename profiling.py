@@ -0,0 +1,173 @@
+import argparse
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+# per-play profile of a scene render, mix ProfiledScene in front of the scene class or run:
+#   python profiling.py graham_scan.py Algorithm --quality low_quality -o media/profiles/graham_scan
+# which writes graham_scan.json (one record per play/wait) and graham_scan.folded (collapsed
+# stacks for flamegraph.pl / speedscope), every play time is split into
+#   construct    python time in the scene code since the previous play (building mobjects and animations)
+#   setup        compiling the animations and calling begin on them
+#   interpolate  updating the mobjects at every frame time, finishing the animations
+#   write        rasterizing the frames and handing them to the movie writer
+#   other        the rest of play (hashing, caching, clean up)
+
+BUCKETS = ('construct', 'setup', 'interpolate', 'write', 'other')
+
+
+class ProfiledScene:
+    # output path without extension, defaults to <media_dir>/profiles/<scene name>
+    profile_output: str|None = None
+
+    def setup(self):
+        super().setup()
+        self.profile = []
+        self._play_timings = None
+        self._timed(self, 'compile_animation_data', 'setup')
+        self._timed(self, 'begin_animations', 'setup')
+        self._timed(self, 'update_to_time', 'interpolate')
+        self._timed(self.renderer, 'render', 'write')
+        self._timed(self.renderer, 'save_static_frame_data', 'write')
+        self._last_play_end = time.perf_counter()
+
+    def _timed(self, owner, name: str, bucket: str):
+        # wraps a bound method on the instance so its time is added to bucket of the running play
+        func = getattr(owner, name, None)
+        if func is None:
+            return
+        def timed(*args, **kwargs):
+            if self._play_timings is None:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._play_timings[bucket] += time.perf_counter() - start
+        setattr(owner, name, timed)
+
+    def _call_site(self) -> tuple[str, list[str]]:
+        # innermost line of scene code that asked for the play and the scene code stack down to construct,
+        # frames of manim and of the play/wait overrides of the scene mixins are skipped
+        import manim
+        manim_dir = os.path.dirname(manim.__file__)
+        frame, frames = sys._getframe(2), []
+        while frame is not None:
+            code = frame.f_code
+            if not code.co_filename.startswith(manim_dir) and code.co_filename != __file__ and not (
+                code.co_name in ('play', 'wait') and frame.f_locals.get('self') is self
+            ):
+                frames.append(frame)
+                if code.co_name == 'construct':
+                    break
+            frame = frame.f_back
+        if not frames:
+            return '?', []
+        source = f'{os.path.basename(frames[0].f_code.co_filename)}:{frames[0].f_lineno}'
+        # co_qualname only exists from python 3.11
+        names = [getattr(frame.f_code, 'co_qualname', frame.f_code.co_name) for frame in reversed(frames)]
+        return source, [name.replace('.<locals>', '') for name in names] + [source]
+
+    def play(self, *args, **kwargs):
+        if self._play_timings is not None:
+            return super().play(*args, **kwargs)
+        source, stack = self._call_site()
+        start = time.perf_counter()
+        timings = dict.fromkeys(BUCKETS, 0.0)
+        timings['construct'] = start - self._last_play_end
+        self._play_timings = timings
+        try:
+            super().play(*args, **kwargs)
+        finally:
+            self._play_timings = None
+        end = time.perf_counter()
+        timings['other'] = (end - start) - sum(timings[b] for b in BUCKETS if b != 'construct')
+        animations = [type(a).__name__ for a in args if not isinstance(a, (list, tuple))]
+        self.profile.append({
+            'index': len(self.profile),
+            'kind': 'wait' if animations == ['Wait'] else 'play',
+            'source': source,
+            'stack': stack,
+            'animations': animations,
+            'run_time': getattr(self, 'duration', 0.0),
+            'skipped': self.renderer.skip_animations,
+            'mobjects': len(self.mobjects),
+            'family': len(self.get_mobject_family_members()),
+            **timings,
+            'total': end - self._last_play_end
+        })
+        self._last_play_end = time.perf_counter()
+
+    def tear_down(self):
+        super().tear_down()
+        # python time after the last play
+        tail = dict.fromkeys(BUCKETS, 0.0)
+        tail['construct'] = time.perf_counter() - self._last_play_end
+        self.profile.append({
+            'index': len(self.profile),
+            'kind': 'end',
+            'source': 'end',
+            'stack': [f'{type(self).__name__}.construct', 'end'],
+            'animations': [],
+            'run_time': 0.0,
+            'skipped': False,
+            'mobjects': len(self.mobjects),
+            'family': len(self.get_mobject_family_members()),
+            **tail,
+            'total': tail['construct']
+        })
+        from manim import config
+        output = self.profile_output or os.path.join(config.media_dir, 'profiles', type(self).__name__)
+        os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+        self.write_profile_json(output + '.json')
+        self.write_profile_collapsed(output + '.folded')
+
+    def profile_summary(self) -> dict[str, dict[str, float]]:
+        # total time per bucket for every call site, sorted by decreasing total
+        summary = defaultdict(lambda: dict.fromkeys(BUCKETS + ('total', 'count'), 0.0))
+        for record in self.profile:
+            entry = summary[record['source']]
+            for key in BUCKETS + ('total',):
+                entry[key] += record[key]
+            entry['count'] += 1
+        return dict(sorted(summary.items(), key=lambda item: -item[1]['total']))
+
+    def write_profile_json(self, path: str):
+        with open(path, 'w') as f:
+            json.dump({'scene': type(self).__name__, 'plays': self.profile, 'summary': self.profile_summary()}, f, indent=2)
+
+    def write_profile_collapsed(self, path: str):
+        # one 'frame;frame;...;bucket microseconds' line per distinct stack, the flamegraph input format
+        folded = defaultdict(int)
+        for record in self.profile:
+            for bucket in BUCKETS:
+                folded[';'.join(record['stack'] + [bucket])] += round(record[bucket]*1e6)
+        with open(path, 'w') as f:
+            f.writelines(f'{stack} {us}\n' for stack, us in folded.items() if us > 0)
+
+
+def profiled(scene_class):
+    return type(scene_class.__name__, (ProfiledScene, scene_class), {})
+
+
+if __name__ == '__main__':
+    from parallel_render import _load_scene_class
+    parser = argparse.ArgumentParser(description='render a scene and write its per-play profile')
+    parser.add_argument('module_path')
+    parser.add_argument('scene_name')
+    parser.add_argument('-o', '--output', default=None, help='profile path without extension')
+    parser.add_argument('--quality', default='low_quality')
+    parser.add_argument('--top', type=int, default=15, help='number of call sites to print')
+    args = parser.parse_args()
+
+    from manim import tempconfig
+    scene_class = profiled(_load_scene_class(args.module_path, args.scene_name))
+    scene_class.profile_output = args.output
+    with tempconfig({'quality': args.quality, 'disable_caching': True, 'verbosity': 'WARNING'}):
+        scene = scene_class()
+        scene.render()
+    print(f"{'call site':32s}" + ''.join(f'{b:>12s}' for b in BUCKETS + ('total',)) + f"{'count':>7s}")
+    for source, entry in list(scene.profile_summary().items())[:args.top]:
+        print(f'{source:32s}' + ''.join(f'{entry[b]*1000:10.1f}ms' for b in BUCKETS + ('total',)) + f"{int(entry['count']):7d}")
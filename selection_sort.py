@@ -1,6 +1,7 @@
 from manim import *
 from data_structures.oned_array import Array
 from data_structures.pointer import Pointer
+from algorithms.selection_sort import selection_sort
 
 
 class Algorithm(Scene):
@@ -44,18 +45,3 @@ class Algorithm(Scene):
 
     def construct(self):
         self.selection_sort([4, 10, -3, 5, 200, 0, 4, 8, 9, 4, 12])
-
-
-def selection_sort(values: list[any]):
-    for i in range(len(values)):
-        min_idx = i
-        for j in range(i+1, len(values)):
-            if values[j] < values[min_idx]:
-                min_idx = j
-        values[i], values[min_idx] = values[min_idx], values[i]
-    return values
-
-
-if __name__ == '__main__':
-    values = [4, 10, -3, 5, 200, 0, 4, 8, 9, 4, 12]
-    print(selection_sort(values))
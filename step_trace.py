@@ -0,0 +1,67 @@
+from typing import Callable
+from algorithms.step_trace import Step, Tracer, pacing_plan, record, split_steps
+
+
+class StepScene:
+    # mixin for Scene subclasses that render an algorithm from its step trace,
+    # everything before start_step is played without being rendered and the scene
+    # ends early when reaching stop_step, so a trace can be rendered in independent segments
+    start_step: int = 0
+    stop_step: int|None = None
+    # kind of the step that starts a loop iteration, segments are only cut in front of it
+    iteration_step: str|None = None
+    # pacing (see pacing_plan), disabled when detailed_iterations is None, iterations holding
+    # a step of interesting_steps are always played in full
+    detailed_iterations: int|None = None
+    interesting_steps: set[str] = frozenset()
+    pacing_growth: float = 2.0
+    # run_time multiplier applied to play and wait while replaying
+    pace: float = 1.0
+
+    def setup(self):
+        super().setup()
+        if self.start_step > 0:
+            self.next_section('setup', skip_animations=True)
+
+    def play(self, *args, **kwargs):
+        # a run_time given to play overrides the animations' own, otherwise each animation keeps its
+        # own duration scaled, Scene.wait goes through here with a Wait of the requested duration
+        if self.pace != 1.0:
+            if 'run_time' in kwargs:
+                kwargs['run_time'] *= self.pace
+            else:
+                from manim.animation.animation import prepare_animation
+                args = [self._paced(prepare_animation(arg)) for arg in self._flatten(args)]
+        super().play(*args, **kwargs)
+
+    @staticmethod
+    def _flatten(args) -> list:
+        # play accepts animations and lists of them
+        return [a for arg in args for a in (StepScene._flatten(arg) if isinstance(arg, (list, tuple)) else [arg])]
+
+    def _paced(self, animation):
+        animation.run_time = animation.run_time*self.pace
+        return animation
+
+    def replay(self, steps: list[Step], handlers: dict[str, Callable]):
+        self.steps = steps
+        speeds = None
+        if self.detailed_iterations is not None and self.iteration_step is not None:
+            speeds = pacing_plan(
+                steps, self.iteration_step, self.detailed_iterations, self.interesting_steps, self.pacing_growth
+            )
+        skipping = False
+        for n, step in enumerate(steps):
+            if n == self.stop_step:
+                from manim.utils.exceptions import EndSceneEarlyException
+                raise EndSceneEarlyException()
+            if n == self.start_step and n > 0:
+                self.next_section(f'step {n}')
+            if speeds is not None and n >= self.start_step:
+                # skipped iterations still run their handlers so the scene state stays right
+                if (speeds[n] == 0.0) != skipping:
+                    skipping = speeds[n] == 0.0
+                    self.next_section(f'step {n}', skip_animations=skipping)
+                self.pace = speeds[n] or 1.0
+            handlers[step.kind](*step.args)
+        self.pace = 1.0
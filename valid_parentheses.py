@@ -1,9 +1,16 @@
 from manim import *
+from itertools import accumulate
 from data_structures.stack import Stack
 from data_structures.pointer import Pointer
+from step_trace import StepScene, record
+from algorithms.valid_parentheses import (
+    BracketDocument, BracketSummary, combine_brackets, first_error, first_error_file, resolve_brackets,
+    summarize_brackets, valid_parentheses
+)
 
 
-class Algorithm(Scene):
+class Algorithm(StepScene, Scene):
+    iteration_step = 'move_pointer'
 
     def valid_parentheses(self, s: str, anim_speed: float=1.0):
         opening_par = {'(', '{', '['}
@@ -12,13 +19,17 @@ class Algorithm(Scene):
 
         assert set(s).issubset(opening_par.union(closing_par)), \
         "string s must be made of parentheses only (){}[]"
+        _, steps = record(valid_parentheses, s)
 
         s_text = Text(f'"{s}"', font='Consolas', font_size=40)
         s_text.scale_to_fit_width(
             min(s_text.width, config.frame_width*0.7)
         ).shift(config.frame_width*0.1*RIGHT)
         fh, fw = config.frame_height, config.frame_width
-        stack = Stack([], 'stack', stack_bottom=fh/2*0.9*DOWN + fw*0.4*LEFT)
+        # the stack is laid out for its deepest point up front so it never rescales while pushing,
+        # on deep inputs only its top cells are shown
+        depth = max(accumulate({'push': 1, 'pop': -1}.get(step.kind, 0) for step in steps), default=0)
+        stack = Stack([], 'stack', stack_bottom=fh/2*0.9*DOWN + fw*0.4*LEFT, capacity=depth, max_visible=8)
         ptr = Pointer(Pointer.triangle)
         map_text = Text("( )    { }    [ ]", font_size=48).next_to(s_text, UP, buff=1.5).shift(3*RIGHT)
         valid_pairs_text = Text("valid open/close pairs:", font_size=28).next_to(map_text, UP)
@@ -26,110 +37,98 @@ class Algorithm(Scene):
             *[Create(obj) for obj in [s_text, stack, ptr, valid_pairs_text, map_text]], 
             run_time=1/anim_speed
         )
-        success = True
-        for i in range(1, len(s_text)-1):
-            self.play(ptr.point_at(s_text[i]), run_time=0.5/anim_speed)
-            par = s[i-1]
-            if par in opening_par:
-                self.play(
-                    stack.push(par, src_pos=s_text[i]), s_text[i].animate.set_color(GREEN),
-                    run_time=0.5/anim_speed
-                )
-            elif len(stack.elems) == 0:
-                x_character = Text('X', color=RED, font='Consolas', font_size=70).next_to(stack, UP)
-                failure_reason = Text(
-                    'Closing parentheses with empty stack', color=RED, font_size=36
-                ).next_to(s_text, DOWN, buff=1.0)
-                failure_text = Text(
-                    'Invalid parentheses sequence!', color=RED, font_size=50
-                ).next_to(failure_reason, DOWN)
-                self.play(
-                    FadeIn(x_character),
-                    s_text[i].animate.set_color(RED),
-                    Write(failure_reason),
-                    Write(failure_text),
-                    run_time=2.0/anim_speed
-                )
-                success = False
-                break
-            elif close_open_map[par] != stack.elems[-1].value:
-                failure_reason = Text(
-                    f"'{par}' doesn't match latest opening parentheses '{stack.elems[-1].value}'", color=RED, font_size=32
-                ).next_to(s_text, DOWN, buff=1.0)
-                failure_text = Text(
-                    'Invalid parentheses sequence!', color=RED, font_size=50
-                ).next_to(failure_reason, DOWN)
-                self.play(
-                    stack.elems[-1].highlight(RED, RED, BLACK, restore=False),
-                    s_text[i].animate.set_color(RED),
-                    Write(failure_reason),
-                    Write(failure_text),
-                    run_time=2.0/anim_speed
-                )
-                success = False
-                break
-            else:
-                self.play(
-                    stack.elems[-1].highlight(GREEN, GREEN, BLACK, restore=False),
-                    s_text[i].animate.set_color(GREEN),
-                    run_time=0.5/anim_speed
-                )
-                self.play(stack.pop(), run_time=1/anim_speed)
-        if success:
-            if len(stack.elems) > 0:
-                failure_reason = Text(
-                    f"There are remaining unclosed parentheses", color=RED, font_size=32
-                ).next_to(s_text, DOWN, buff=1.0)
-                failure_text = Text(
-                    'Invalid parentheses sequence!', color=RED, font_size=50
-                ).next_to(failure_reason, DOWN)
-                self.play(
-                    *[elem.highlight(
-                        RED, RED, BLACK, scale_ratio=1.0, restore=False
-                    ) for elem in stack.elems],
-                    FadeOut(ptr),
-                    Write(failure_reason),
-                    Write(failure_text),
-                    run_time=2.0/anim_speed
-                )
-            else:
-                success_text = Text(
-                    'Valid parentheses sequence!', color=GREEN, font_size=60
-                ).next_to(s_text, DOWN, buff=1.0)
-                self.play(
-                    FadeOut(ptr),
-                    Write(success_text),
-                    run_time=2.0/anim_speed
-                )
-        self.wait(4/anim_speed)
 
-    def construct(self):
-        s = '(({[({})]}()[([])])){()()}'
+        def on_move_pointer(i):
+            self.play(ptr.point_at(s_text[i+1]), run_time=0.5/anim_speed)
 
-        anim_speed = 2.0
-        self.valid_parentheses(s, anim_speed)
+        def on_push(i, par):
+            self.play(
+                stack.push(par, src_pos=s_text[i+1]), s_text[i+1].animate.set_color(GREEN),
+                run_time=0.5/anim_speed
+            )
 
+        def on_empty_stack(i, par):
+            x_character = Text('X', color=RED, font='Consolas', font_size=70).next_to(stack, UP)
+            failure_reason = Text(
+                'Closing parentheses with empty stack', color=RED, font_size=36
+            ).next_to(s_text, DOWN, buff=1.0)
+            failure_text = Text(
+                'Invalid parentheses sequence!', color=RED, font_size=50
+            ).next_to(failure_reason, DOWN)
+            self.play(
+                FadeIn(x_character),
+                s_text[i+1].animate.set_color(RED),
+                Write(failure_reason),
+                Write(failure_text),
+                run_time=2.0/anim_speed
+            )
+            self.wait(4/anim_speed)
 
-def valid_parentheses(s: str):
-    stack = []
-    opening_par = {'(', '{', '['}
-    closing_par = {')', '}', ']'}
-    close_open_map = {')': '(', '}': '{', ']': '['}
+        def on_mismatch(i, par, top):
+            failure_reason = Text(
+                f"'{par}' doesn't match latest opening parentheses '{top}'", color=RED, font_size=32
+            ).next_to(s_text, DOWN, buff=1.0)
+            failure_text = Text(
+                'Invalid parentheses sequence!', color=RED, font_size=50
+            ).next_to(failure_reason, DOWN)
+            self.play(
+                stack.elems[-1].highlight(RED, RED, BLACK, restore=False),
+                s_text[i+1].animate.set_color(RED),
+                Write(failure_reason),
+                Write(failure_text),
+                run_time=2.0/anim_speed
+            )
+            self.wait(4/anim_speed)
 
-    assert set(s).issubset(opening_par.union(closing_par)), \
-        "string s must be made of parentheses only (){}[]"
-    
-    for par in s:
-        if par in opening_par:
-            stack.append(par)
-        elif len(stack) == 0 or close_open_map[par] != stack[-1]:
-            return False
-        else:
-            stack.pop()
-    
-    return len(stack) == 0
+        def on_pop(i, par):
+            self.play(
+                stack.elems[-1].highlight(GREEN, GREEN, BLACK, restore=False),
+                s_text[i+1].animate.set_color(GREEN),
+                run_time=0.5/anim_speed
+            )
+            self.play(stack.pop(), run_time=1/anim_speed)
+
+        def on_unclosed(count):
+            failure_reason = Text(
+                f"There are remaining unclosed parentheses", color=RED, font_size=32
+            ).next_to(s_text, DOWN, buff=1.0)
+            failure_text = Text(
+                'Invalid parentheses sequence!', color=RED, font_size=50
+            ).next_to(failure_reason, DOWN)
+            self.play(
+                stack.highlight(
+                    color=RED, stroke_color=RED, font_color=BLACK, scale_ratio=1.0, restore=False
+                ),
+                FadeOut(ptr),
+                Write(failure_reason),
+                Write(failure_text),
+                run_time=2.0/anim_speed
+            )
+            self.wait(4/anim_speed)
 
+        def on_valid():
+            success_text = Text(
+                'Valid parentheses sequence!', color=GREEN, font_size=60
+            ).next_to(s_text, DOWN, buff=1.0)
+            self.play(
+                FadeOut(ptr),
+                Write(success_text),
+                run_time=2.0/anim_speed
+            )
+            self.wait(4/anim_speed)
 
-if __name__ == '__main__':
-    s = '(){}[({(())})](())((})'
-    print(valid_parentheses(s))
+        self.replay(steps, {
+            'move_pointer': on_move_pointer,
+            'push': on_push,
+            'empty_stack': on_empty_stack,
+            'mismatch': on_mismatch,
+            'pop': on_pop,
+            'unclosed': on_unclosed,
+            'valid': on_valid
+        })
+
+    def construct(self):
+        s = '(({[({})]}()[([])])){()()}'
+
+        anim_speed = 2.0
+        self.valid_parentheses(s, anim_speed)